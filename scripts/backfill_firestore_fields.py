@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Backfill derived fields on existing Firestore media records.
+
+Records written before a derived field was introduced don't have it yet.
+This script computes and stores those fields so queries that depend on them
+find every record, and rebuilds the filter options document from the stored
+years and categories.
+"""
+
+import os
+import sys
+import argparse
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.firestore_db import get_firestore_db
+
+
+def main():
+    """Main function to parse arguments and run the backfill"""
+    parser = argparse.ArgumentParser(description="Backfill derived fields on Firestore media records")
+    parser.add_argument('--batch-size', type=int, default=500,
+                        help="Number of updates per write batch (default: 500)")
+    parser.add_argument('--skip-filter-options', action='store_true',
+                        help="Don't rebuild the filter options document")
+
+    args = parser.parse_args()
+
+    db = get_firestore_db()
+
+    print("Backfilling search fields...")
+    updated = db.backfill_search_fields(batch_size=args.batch_size)
+    print(f"Updated {updated} records")
+
+    if not args.skip_filter_options:
+        print("Rebuilding filter options...")
+        options = db.rebuild_filter_options()
+        print(f"Stored {len(options['years'])} years and {len(options['categories'])} categories")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,7 @@ import os
 import sys
 import glob
 import re
+from concurrent.futures import ThreadPoolExecutor
 
 # Add parent directory to path so we can import our module
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -55,6 +56,8 @@ def main():
                        help="Audio format to convert to (default: mp3)")
     parser.add_argument('--limit', '-l', type=int, 
                        help="Limit the number of videos to download")
+    parser.add_argument('--workers', '-w', type=int, default=4,
+                       help="Number of meetings to download at once (default: 4)")
     
     args = parser.parse_args()
     
@@ -79,15 +82,18 @@ def main():
     existing_downloads = get_existing_downloads(args.output_dir, args.year, args.category)
     print(f"Found {len(existing_downloads)} already downloaded dates: {sorted(existing_downloads)}")
     
-    # Find missing meetings
+    # Find missing meetings, once each even if the listing repeats a meeting, so
+    # no two download threads write the same meeting directory
     missing_meetings = []
+    seen_urls = set()
     for meeting in all_meetings:
         date_parts = meeting["date"].split(" ")
         if len(date_parts) >= 2:
             # Format date as "Month Day" (e.g., "January 8")
             meeting_date = f"{date_parts[0]} {date_parts[1].rstrip(',')}"
             
-            if meeting_date not in existing_downloads:
+            if meeting_date not in existing_downloads and meeting["url"] not in seen_urls:
+                seen_urls.add(meeting["url"])
                 missing_meetings.append(meeting)
     
     if not missing_meetings:
@@ -103,22 +109,33 @@ def main():
         print(f"Limiting to {args.limit} missing meetings")
         missing_meetings = missing_meetings[:args.limit]
     
-    # Download missing meetings
-    successful_downloads = 0
-    for i, meeting in enumerate(missing_meetings, 1):
+    def download(numbered_meeting):
+        i, meeting = numbered_meeting
         date = meeting["date"]
         date_parts = date.split(" ")
-        if len(date_parts) >= 2:
-            target_date = f"{date_parts[0]} {date_parts[1].rstrip(',')}"  # e.g., "January 8"
-            
-            print(f"\nDownloading missing meeting {i}/{len(missing_meetings)}: {date}")
-            success = downloader.download_specific_meeting(args.year, args.category, target_date)
-            
-            if success:
-                print(f"Successfully downloaded {date}")
-                successful_downloads += 1
-            else:
-                print(f"Failed to download {date}")
+        if len(date_parts) < 2:
+            return False
+        target_date = f"{date_parts[0]} {date_parts[1].rstrip(',')}"  # e.g., "January 8"
+        
+        print(f"\nDownloading missing meeting {i}/{len(missing_meetings)}: {date}")
+        # Hand over just this meeting, so each thread downloads only its own;
+        # audio conversions are collected at the end
+        success = downloader.download_specific_meeting(
+            args.year, args.category, target_date, wait_for_audio=False, meetings=[meeting]
+        )
+        
+        if success:
+            print(f"Successfully downloaded {date}")
+        else:
+            print(f"Failed to download {date}")
+        return success
+    
+    # Download missing meetings; they're network-bound, so several run at once
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as executor:
+        successful_downloads = sum(map(bool, executor.map(download, enumerate(missing_meetings, 1))))
+    
+    # Let any audio conversions still running finish
+    downloader.wait_for_conversions()
     
     print(f"\nCompleted! Downloaded {successful_downloads}/{len(missing_meetings)} missing videos.")
 
@@ -9,17 +9,17 @@ and years/categories.
 
 import os
 import sys
-import glob
 import time
 import logging
 import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from tqdm import tqdm
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 # Import the GoogleCloudStorage class
-from src.cloud_storage import GoogleCloudStorage
+from src.cloud_storage import GoogleCloudStorage, LIST_BLOB_NAME_FIELDS
 
 # Set up logging
 log_dir = os.path.join('data', 'logs')
@@ -49,13 +49,13 @@ def find_media_files(base_dir, media_type, year=None, category=None):
     Returns:
         list: List of file paths
     """
-    # Determine the file extension pattern based on media type
+    # Determine the file extensions based on media type
     if media_type == 'video':
-        extensions = ['mp4', 'avi', 'mov']
+        extensions = {'.mp4', '.avi', '.mov'}
     elif media_type == 'audio':
-        extensions = ['mp3', 'wav', 'm4a']
+        extensions = {'.mp3', '.wav', '.m4a'}
     elif media_type == 'transcript':
-        extensions = ['txt']
+        extensions = {'.txt'}
     else:
         logger.error(f"Invalid media type: {media_type}")
         return []
@@ -67,13 +67,16 @@ def find_media_files(base_dir, media_type, year=None, category=None):
     if category:
         search_dir = os.path.join(search_dir, category)
     
-    # Find all matching files
+    # Find all matching files in a single walk of the tree, rather than one
+    # recursive glob per extension; hidden files and directories are skipped
+    # as the glob did
     all_files = []
-    for ext in extensions:
-        # Search recursively through all subdirectories
-        pattern = os.path.join(search_dir, '**', f'*.{ext}')
-        files = glob.glob(pattern, recursive=True)
-        all_files.extend(files)
+    for dir_path, dir_names, file_names in os.walk(search_dir, followlinks=True):
+        dir_names[:] = [name for name in dir_names if not name.startswith('.')]
+        all_files.extend(
+            os.path.join(dir_path, name) for name in file_names
+            if not name.startswith('.') and os.path.splitext(name)[1] in extensions
+        )
     
     return all_files
 
@@ -101,10 +104,37 @@ def get_gcs_path(local_path, base_dir):
     
     return relative_path
 
+def list_existing_paths(gcs, base_dir, year=None, category=None):
+    """
+    List the object names already in the bucket under the migrated directory.
+    
+    Args:
+        gcs (GoogleCloudStorage): GCS client
+        base_dir (str): Base directory containing media files
+        year (str, optional): Filter by year
+        category (str, optional): Filter by category
+        
+    Returns:
+        set: Object names in the bucket under the matching prefix
+    """
+    search_dir = base_dir
+    if year:
+        search_dir = os.path.join(search_dir, year)
+    if category:
+        search_dir = os.path.join(search_dir, category)
+    
+    prefix = get_gcs_path(search_dir, base_dir)
+    if prefix:
+        prefix += '/'
+    
+    # Only object names are needed, so skip the rest of the metadata in each page
+    blobs = gcs.client.list_blobs(gcs.bucket_name, prefix=prefix or None, fields=LIST_BLOB_NAME_FIELDS)
+    return {blob.name for blob in blobs}
+
 def migrate_to_gcs(bucket_name, base_dir, media_types=None, 
                   year=None, category=None, credentials_path=None, 
                   public=False, batch_size=10, rate_limit=1, 
-                  dry_run=False, force=False, limit=None):
+                  dry_run=False, force=False, limit=None, workers=4):
     """
     Migrate files to Google Cloud Storage.
     
@@ -117,10 +147,11 @@ def migrate_to_gcs(bucket_name, base_dir, media_types=None,
         credentials_path (str, optional): Path to service account credentials file
         public (bool): Whether to make files publicly accessible
         batch_size (int): Number of files to process in a batch before reporting progress
-        rate_limit (int): Sleep time between uploads (seconds)
+        rate_limit (int): Sleep time between uploads (seconds), applied per worker
         dry_run (bool): If True, just list files without uploading
         force (bool): If True, upload even if file already exists in GCS
         limit (int, optional): Limit the number of files to process
+        workers (int): Number of files uploaded concurrently
         
     Returns:
         dict: Migration statistics
@@ -131,6 +162,14 @@ def migrate_to_gcs(bucket_name, base_dir, media_types=None,
     # Initialize GCS client
     gcs = GoogleCloudStorage(bucket_name, credentials_path)
     
+    # Index the objects already uploaded once per run, instead of checking each
+    # file with its own exists() request
+    existing_paths = set()
+    if not dry_run and not force:
+        logger.info("Listing files already in GCS...")
+        existing_paths = list_existing_paths(gcs, base_dir, year, category)
+        logger.info(f"Found {len(existing_paths)} files already in GCS")
+    
     # Statistics
     stats = {
         'total': 0,
@@ -158,9 +197,20 @@ def migrate_to_gcs(bucket_name, base_dir, media_types=None,
         
         logger.info(f"Migrating {len(files)} {media_type} files to GCS bucket: {bucket_name}")
         
+        def upload(local_path, remote_path):
+            result = gcs.upload_file(local_path, remote_path, make_public=public)
+            
+            # Rate limiting
+            if rate_limit > 0:
+                time.sleep(rate_limit)
+            
+            return result
+        
         # Use tqdm for progress reporting
-        with tqdm(total=len(files), desc=f"Uploading {media_type}", unit="file") as progress:
-            for i, local_path in enumerate(files):
+        with tqdm(total=len(files), desc=f"Uploading {media_type}", unit="file") as progress, \
+                ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            futures = []
+            for local_path in files:
                 # Get GCS path
                 remote_path = get_gcs_path(local_path, base_dir)
                 
@@ -173,18 +223,18 @@ def migrate_to_gcs(bucket_name, base_dir, media_types=None,
                     continue
                 
                 # Check if file already exists in GCS
-                blob = gcs.bucket.blob(remote_path)
-                if blob.exists() and not force:
+                if remote_path in existing_paths:
                     logger.info(f"Skipping (already exists): gs://{bucket_name}/{remote_path}")
                     stats['types'][media_type]['skipped'] += 1
                     stats['skipped'] += 1
                     progress.update(1)
                     continue
                 
-                # Upload the file
-                result = gcs.upload_file(local_path, remote_path, make_public=public)
-                
-                if result:
+                # Upload the file; uploads are network-bound, so several run at once
+                futures.append(executor.submit(upload, local_path, remote_path))
+            
+            for i, future in enumerate(as_completed(futures)):
+                if future.result():
                     stats['types'][media_type]['success'] += 1
                     stats['success'] += 1
                 else:
@@ -194,13 +244,9 @@ def migrate_to_gcs(bucket_name, base_dir, media_types=None,
                 # Update progress
                 progress.update(1)
                 
-                # Rate limiting
-                if i < len(files) - 1 and rate_limit > 0:
-                    time.sleep(rate_limit)
-                
                 # Batch reporting
-                if (i + 1) % batch_size == 0 or i == len(files) - 1:
-                    logger.info(f"Progress: {i + 1}/{len(files)} {media_type} files processed")
+                if (i + 1) % batch_size == 0 or i == len(futures) - 1:
+                    logger.info(f"Progress: {i + 1}/{len(futures)} {media_type} uploads completed")
         
         logger.info(f"Completed {media_type} migration: {stats['types'][media_type]['success']} succeeded, "
                    f"{stats['types'][media_type]['skipped']} skipped, "
@@ -241,7 +287,9 @@ def main():
     parser.add_argument('--batch-size', type=int, default=10,
                         help='Number of files to process in a batch')
     parser.add_argument('--rate-limit', type=int, default=1,
-                        help='Sleep time between uploads (seconds)')
+                        help='Sleep time between uploads (seconds), per worker')
+    parser.add_argument('--workers', type=int, default=4,
+                        help='Number of files to upload concurrently')
     parser.add_argument('--dry-run', action='store_true',
                         help='List files without uploading')
     parser.add_argument('--force', action='store_true',
@@ -271,7 +319,8 @@ def main():
             rate_limit=args.rate_limit,
             dry_run=args.dry_run,
             force=args.force,
-            limit=args.limit
+            limit=args.limit,
+            workers=args.workers
         )
     except KeyboardInterrupt:
         logger.info("Migration interrupted by user")
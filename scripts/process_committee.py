@@ -133,7 +133,7 @@ def get_existing_downloads(output_dir, year, category):
             dir_path = os.path.join(category_dir, dir_name)
             has_files = False
             for pattern in ["*.mp4", "*.mp3", "audio/*.mp3"]:
-                if glob.glob(os.path.join(dir_path, pattern)):
+                if next(glob.iglob(os.path.join(dir_path, pattern)), None):
                     has_files = True
                     break
             
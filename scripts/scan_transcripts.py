@@ -8,6 +8,7 @@ import os
 import sys
 import logging
 import re
+import heapq
 import datetime
 from pathlib import Path
 
@@ -17,7 +18,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 from src.transcript_db import (
     add_transcript, 
     update_transcript_status,
-    get_all_transcripts
+    iter_all_transcripts
 )
 
 # Configure logging
@@ -127,10 +128,18 @@ def generate_report():
     """Generate a report of all transcripts in the database."""
     logger.info("Generating transcript report")
     
-    transcripts = get_all_transcripts()
-    total = len(transcripts)
-    processed = sum(1 for t in transcripts if t.processed)
-    uploaded = sum(1 for t in transcripts if t.uploaded)
+    # Stream the records, keeping only the counts and the 10 most recent
+    total = processed = uploaded = 0
+    recent = []
+    for i, transcript in enumerate(iter_all_transcripts()):
+        total += 1
+        processed += bool(transcript.processed)
+        uploaded += bool(transcript.uploaded)
+        entry = (transcript.last_modified or datetime.datetime.min, -i, transcript)
+        if len(recent) < 10:
+            heapq.heappush(recent, entry)
+        else:
+            heapq.heappushpop(recent, entry)
     
     print(f"\nTranscript Database Report")
     print(f"=========================")
@@ -143,7 +152,7 @@ def generate_report():
     print(f"\nRecent transcripts:")
     
     # Show 10 most recent transcripts
-    for i, transcript in enumerate(sorted(transcripts, key=lambda t: t.last_modified or datetime.datetime.min, reverse=True)[:10]):
+    for i, (_, _, transcript) in enumerate(sorted(recent, reverse=True)):
         status = "✓" if transcript.uploaded else "⨯"
         print(f"{i+1}. [{status}] {transcript.year}/{transcript.category}/{transcript.session_name}/{transcript.file_name}")
     
@@ -137,6 +137,10 @@ class TranscriptItem(MediaBase):
     """
     url: str
 
+# Document fields read by firestore_to_model; list endpoints fetch only these
+MEDIA_FIELDS = ['category', 'session_name', 'year', 'last_modified', 'created_at',
+                'gcs_path', 'file_name', 'duration']
+
 # Helper functions
 def format_date(timestamp) -> Optional[str]:
     """Format a datetime object to ISO date string."""
@@ -217,16 +221,12 @@ def get_videos(
     try:
         if search:
             # Use search function if search term provided
-            docs = db.search_media(search, media_type='video', year=year, category=category)
+            docs = db.search_media(search, media_type='video', year=year, category=category,
+                                   fields=MEDIA_FIELDS)
         else:
-            # Get all videos and filter manually
-            docs = db.get_all_media(media_type='video')
-            
-            # Apply filters manually
-            if year:
-                docs = [d for d in docs if d.get('year') == year]
-            if category:
-                docs = [d for d in docs if d.get('category') == category]
+            # Get all videos, filtered by year and category server-side
+            docs = db.get_all_media(media_type='video', fields=MEDIA_FIELDS,
+                                    year=year, category=category)
         
         # Convert to response models
         return [VideoItem(**firestore_to_model(doc)) for doc in docs]
@@ -266,16 +266,12 @@ def get_audio_files(
     try:
         if search:
             # Use search function if search term provided
-            docs = db.search_media(search, media_type='audio', year=year, category=category)
+            docs = db.search_media(search, media_type='audio', year=year, category=category,
+                                   fields=MEDIA_FIELDS)
         else:
-            # Get all audio files and filter manually
-            docs = db.get_all_media(media_type='audio')
-            
-            # Apply filters manually
-            if year:
-                docs = [d for d in docs if d.get('year') == year]
-            if category:
-                docs = [d for d in docs if d.get('category') == category]
+            # Get all audio files, filtered by year and category server-side
+            docs = db.get_all_media(media_type='audio', fields=MEDIA_FIELDS,
+                                    year=year, category=category)
         
         # Convert to response models
         return [AudioItem(**firestore_to_model(doc)) for doc in docs]
@@ -315,16 +311,12 @@ def get_transcripts(
     try:
         if search:
             # Use search function if search term provided
-            docs = db.search_media(search, media_type='transcript', year=year, category=category)
+            docs = db.search_media(search, media_type='transcript', year=year, category=category,
+                                   fields=MEDIA_FIELDS)
         else:
-            # Get all transcripts and filter manually
-            docs = db.get_all_media(media_type='transcript')
-            
-            # Apply filters manually
-            if year:
-                docs = [d for d in docs if d.get('year') == year]
-            if category:
-                docs = [d for d in docs if d.get('category') == category]
+            # Get all transcripts, filtered by year and category server-side
+            docs = db.get_all_media(media_type='transcript', fields=MEDIA_FIELDS,
+                                    year=year, category=category)
         
         # Convert to response models
         return [TranscriptItem(**firestore_to_model(doc)) for doc in docs]
@@ -41,6 +41,14 @@ logging.basicConfig(
 
 logger = logging.getLogger('cloud_storage')
 
+# Partial-response field mask for listings that only need object names
+LIST_BLOB_NAME_FIELDS = 'items(name),nextPageToken'
+
+# Files at least this large are uploaded as concurrent chunks instead of one stream
+PARALLEL_UPLOAD_THRESHOLD = 64 * 1024 * 1024
+PARALLEL_UPLOAD_CHUNK_SIZE = 32 * 1024 * 1024
+PARALLEL_UPLOAD_WORKERS = 8
+
 class GoogleCloudStorage:
     """
     Handles Google Cloud Storage operations for media files.
@@ -114,8 +122,12 @@ class GoogleCloudStorage:
             file_size = os.path.getsize(local_path)
             logger.info(f"Uploading {local_path} to gs://{self.bucket_name}/{remote_path} ({file_size/1024/1024:.2f} MB)")
             
-            # Upload the file
-            blob.upload_from_filename(local_path)
+            # Upload the file; large videos go up as concurrent chunks, since one
+            # HTTPS stream can't saturate the link
+            if file_size >= PARALLEL_UPLOAD_THRESHOLD:
+                self._upload_chunks_concurrently(local_path, blob)
+            else:
+                blob.upload_from_filename(local_path)
             
             # Make public if requested
             if make_public:
@@ -132,6 +144,32 @@ class GoogleCloudStorage:
             logger.error(f"Error uploading file {local_path}: {e}")
             return None
     
+    def _upload_chunks_concurrently(self, local_path, blob):
+        """
+        Upload a large file as concurrently uploaded chunks of one multipart upload.
+        
+        Falls back to a single-stream upload if the installed google-cloud-storage
+        doesn't provide transfer_manager.upload_chunks_concurrently.
+        
+        Args:
+            local_path (str): Local path to the file to upload
+            blob: Destination blob, with its content type already set
+        """
+        try:
+            from google.cloud.storage import transfer_manager
+            upload_chunks_concurrently = transfer_manager.upload_chunks_concurrently
+        except (ImportError, AttributeError):
+            blob.upload_from_filename(local_path)
+            return
+        
+        upload_chunks_concurrently(
+            local_path,
+            blob,
+            chunk_size=PARALLEL_UPLOAD_CHUNK_SIZE,
+            worker_type=transfer_manager.THREAD,
+            max_workers=PARALLEL_UPLOAD_WORKERS
+        )
+    
     def download_file(self, remote_path, local_path):
         """
         Download a file from Google Cloud Storage.
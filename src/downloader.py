@@ -10,14 +10,64 @@ import os
 import re
 import requests
 import logging
+import logging.handlers
+import queue
+import atexit
 import time
 import urllib.parse
 import hashlib
 import json
 import subprocess
 import shutil
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor, wait
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 from urllib.parse import urlparse, parse_qs
+from urllib3.util.retry import Retry
+
+# Resolve the ffmpeg/ffprobe executables once instead of searching $PATH per file
+_FFMPEG = shutil.which('ffmpeg')
+_FFPROBE = shutil.which('ffprobe')
+
+# Read size used when streaming media downloads to disk
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Number of candidate URLs probed at once
+URL_PROBE_WORKERS = 8
+
+
+def _configure_logging(log_file):
+    """
+    Configure root logging so file and console writes happen on a background thread.
+    
+    Records are handed to a QueueListener, so worker threads never block on the
+    stdout lock or on disk I/O while downloading and converting media.
+    
+    Args:
+        log_file (str): Path to the log file
+    """
+    if logging.getLogger().handlers:
+        # Logging is already configured by the calling script
+        return
+    
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(
+        log_queue,
+        logging.FileHandler(log_file),
+        logging.StreamHandler()
+    )
+    listener.start()
+    atexit.register(listener.stop)
+    
+    # The QueueHandler formats each record before queueing it, so the format is
+    # set here and the listener's handlers write the message as is
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[logging.handlers.QueueHandler(log_queue)]
+    )
 
 
 class IdahoLegislatureDownloader:
@@ -45,14 +95,7 @@ class IdahoLegislatureDownloader:
         if log_dir and not os.path.exists(log_dir):
             os.makedirs(log_dir)
             
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_file),
-                logging.StreamHandler()
-            ]
-        )
+        _configure_logging(log_file)
         self.logger = logging.getLogger(__name__)
         self.output_dir = output_dir
         self.convert_to_audio = convert_to_audio
@@ -60,7 +103,7 @@ class IdahoLegislatureDownloader:
         
         # Check for ffmpeg if audio conversion is requested
         if self.convert_to_audio:
-            self.ffmpeg_available = shutil.which('ffmpeg') is not None
+            self.ffmpeg_available = _FFMPEG is not None
             if not self.ffmpeg_available:
                 self.logger.warning("ffmpeg not found. Audio conversion will be skipped.")
                 self.logger.warning("Installation instructions:")
@@ -68,12 +111,30 @@ class IdahoLegislatureDownloader:
                 self.logger.warning("  Ubuntu/Debian: sudo apt-get install ffmpeg")
                 self.logger.warning("  Windows: Download from https://ffmpeg.org/download.html")
         
+        # Audio conversion runs on a background worker so the next download can
+        # start while ffmpeg is still transcoding the previous file. The executor
+        # only starts its thread on first use, so it's safe to create up front,
+        # which also lets several download threads queue conversions
+        self._conversion_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="audio-convert")
+        self._pending_conversions = []
+        # Guards _pending_conversions against concurrent queueing and waiting
+        self._conversions_lock = threading.Lock()
+        
+        # Shared by every URL probe, including those from concurrent download threads
+        self._probe_executor = ThreadPoolExecutor(max_workers=URL_PROBE_WORKERS, thread_name_prefix="url-probe")
+        
         # Create output directory if it doesn't exist
         if not os.path.exists(output_dir):
             os.makedirs(output_dir)
         
         # Set up session for maintaining cookies across requests
         self.session = requests.Session()
+        # Retry transient server errors with backoff instead of failing the download outright
+        retry = Retry(total=3, backoff_factor=0.3, status_forcelist=[500, 502, 503, 504])
+        # Pool enough connections for several meetings downloading at once
+        adapter = HTTPAdapter(max_retries=retry, pool_connections=16, pool_maxsize=16)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
         # Set a User-Agent to mimic a browser
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36'
@@ -103,9 +164,16 @@ class IdahoLegislatureDownloader:
                 os.makedirs(output_dir)
             
             with open(output_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
                     if chunk:
                         f.write(chunk)
+                
+                # Flush the video to disk and drop it from the page cache so a
+                # multi-gigabyte download doesn't evict hotter pages
+                if hasattr(os, 'posix_fadvise'):
+                    f.flush()
+                    os.fsync(f.fileno())
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
             
             self.logger.info(f"Successfully downloaded: {os.path.basename(output_path)}")
             return True
@@ -123,7 +191,6 @@ class IdahoLegislatureDownloader:
         Returns:
             BeautifulSoup: Parsed HTML
         """
-        from bs4 import BeautifulSoup
         return BeautifulSoup(response.text, 'html.parser')
     
     def get_available_options(self, soup):
@@ -367,6 +434,49 @@ class IdahoLegislatureDownloader:
         
         return meeting_links
     
+    def _probe_url(self, url, timeout=None):
+        """
+        Send a HEAD request for a candidate URL.
+        
+        Args:
+            url (str): Candidate URL
+            timeout (float, optional): Request timeout in seconds
+            
+        Returns:
+            int: HTTP status code, or None if the request failed
+        """
+        try:
+            return self.session.head(url, timeout=timeout, allow_redirects=True).status_code
+        except Exception as e:
+            self.logger.debug(f"Error checking URL {url}: {e}")
+            return None
+    
+    def first_available_url(self, urls, timeout=None):
+        """
+        Find the first candidate URL (in priority order) that responds with HTTP 200.
+        
+        All candidates are probed concurrently, so a miss costs one round-trip
+        instead of one per candidate.
+        
+        Args:
+            urls (list): Candidate URLs in order of preference
+            timeout (float, optional): Per-request timeout in seconds
+            
+        Returns:
+            str: The first working URL, or None if none responded
+        """
+        if not urls:
+            return None
+        
+        self.logger.info(f"Trying {len(urls)} candidate URLs: {urls}")
+        # map() yields results in input order, so the first match keeps its priority
+        statuses = self._probe_executor.map(lambda url: self._probe_url(url, timeout), urls)
+        for url, status in zip(urls, statuses):
+            if status == 200:
+                return url
+        
+        return None
+    
     def direct_video_url(self, media_id):
         """
         Try to construct a direct video URL using the media ID.
@@ -387,18 +497,10 @@ class IdahoLegislatureDownloader:
             f"https://idahoptv.org/insession/archive/{media_id}.mp4"
         ]
         
-        # Try each pattern
-        for url in patterns:
-            try:
-                self.logger.info(f"Trying direct URL: {url}")
-                response = self.session.head(url)
-                if response.status_code == 200:
-                    self.logger.info(f"Found working direct URL: {url}")
-                    return url
-            except Exception:
-                pass
-        
-        return None
+        url = self.first_available_url(patterns)
+        if url:
+            self.logger.info(f"Found working direct URL: {url}")
+        return url
     
     def extract_media_urls(self, meeting_url, media_id=None, date=None, title=None):
         """
@@ -467,40 +569,22 @@ class IdahoLegislatureDownloader:
                     
                     # New pattern we discovered
                     pattern_url = f"https://insession.idaho.gov/IIS/{year}/House/Chambers/HouseChambers{month_padded}-{day_padded}-{year}.mp4"
-                    self.logger.info(f"Trying insession.idaho.gov URL: {pattern_url}")
                     
-                    try:
-                        response = self.session.head(pattern_url, timeout=5)
-                        if response.status_code == 200:
-                            self.logger.info(f"Found working insession.idaho.gov URL: {pattern_url}")
-                            media_links.append({
-                                "url": pattern_url,
-                                "text": "insession.idaho.gov MP4 Link"
-                            })
-                            return media_links
-                    except Exception as e:
-                        self.logger.debug(f"Error checking URL {pattern_url}: {e}")
-                    
-                    # Try a few variations
+                    # Plus a few variations
                     variations = [
                         f"https://insession.idaho.gov/IIS/{year}/House/Chambers/House{month_padded}-{day_padded}-{year}.mp4",
                         f"https://insession.idaho.gov/IIS/{year}/House/House{month_padded}-{day_padded}-{year}.mp4",
                         f"https://insession.idaho.gov/IIS/{year}/House/Day{day_padded}.mp4"
                     ]
                     
-                    for var_url in variations:
-                        try:
-                            self.logger.info(f"Trying variation URL: {var_url}")
-                            response = self.session.head(var_url, timeout=5)
-                            if response.status_code == 200:
-                                self.logger.info(f"Found working variation URL: {var_url}")
-                                media_links.append({
-                                    "url": var_url,
-                                    "text": "Variation MP4 Link"
-                                })
-                                return media_links
-                        except Exception as e:
-                            self.logger.debug(f"Error checking URL {var_url}: {e}")
+                    found_url = self.first_available_url([pattern_url] + variations, timeout=5)
+                    if found_url:
+                        self.logger.info(f"Found working insession.idaho.gov URL: {found_url}")
+                        media_links.append({
+                            "url": found_url,
+                            "text": "insession.idaho.gov MP4 Link" if found_url == pattern_url else "Variation MP4 Link"
+                        })
+                        return media_links
         except Exception as e:
             self.logger.warning(f"Error trying insession.idaho.gov patterns: {e}")
         
@@ -528,19 +612,14 @@ class IdahoLegislatureDownloader:
                 f"https://streaming.idaho.gov/house{chamber_id}.mp4"
             ]
             
-            for url in sample_urls:
-                try:
-                    self.logger.info(f"Trying chamber-based URL: {url}")
-                    response = self.session.head(url, timeout=5)
-                    if response.status_code == 200:
-                        self.logger.info(f"Found working chamber-based URL: {url}")
-                        media_links.append({
-                            "url": url,
-                            "text": "Chamber-based MP4 Link"
-                        })
-                        return media_links
-                except Exception as e:
-                    self.logger.debug(f"Error checking URL {url}: {e}")
+            url = self.first_available_url(sample_urls, timeout=5)
+            if url:
+                self.logger.info(f"Found working chamber-based URL: {url}")
+                media_links.append({
+                    "url": url,
+                    "text": "Chamber-based MP4 Link"
+                })
+                return media_links
         
         # Try specific IdahoPTV pattern
         try:
@@ -587,12 +666,13 @@ class IdahoLegislatureDownloader:
             response = self.session.get(meeting_url)
             response.raise_for_status()
             
-            # Save the HTML for debugging
+            # Save the HTML for debugging, one file per meeting page so concurrent
+            # downloads don't write over each other
             debug_dir = os.path.join(self.output_dir, '_debug')
-            if not os.path.exists(debug_dir):
-                os.makedirs(debug_dir)
-                
-            with open(os.path.join(debug_dir, 'meeting_page.html'), 'w', encoding='utf-8') as f:
+            os.makedirs(debug_dir, exist_ok=True)
+            
+            page_hash = hashlib.md5(meeting_url.encode(), usedforsecurity=False).hexdigest()[:12]
+            with open(os.path.join(debug_dir, f'meeting_page_{page_hash}.html'), 'w', encoding='utf-8') as f:
                 f.write(response.text)
             
             soup = BeautifulSoup(response.text, 'html.parser')
@@ -657,13 +737,55 @@ class IdahoLegislatureDownloader:
         
         # Truncate if too long
         if len(safe_name) > max_length:
-            # Create a hash of the full name to ensure uniqueness
-            name_hash = hashlib.md5(safe_name.encode()).hexdigest()[:8]
+            # Create a hash of the full name to ensure uniqueness. This names
+            # directories already on disk, so it must stay MD5; it isn't used for security.
+            name_hash = hashlib.md5(safe_name.encode(), usedforsecurity=False).hexdigest()[:8]
             safe_name = safe_name[:max_length-9] + "_" + name_hash
         
         return safe_name
     
-    def download_specific_meeting(self, year, category, target_date):
+    def _queue_audio_conversion(self, video_path, file_info):
+        """
+        Convert a downloaded video to audio on the background worker.
+        
+        Args:
+            video_path (str): Path to the downloaded video file
+            file_info (dict): File record to update once the conversion finishes
+        """
+        future = self._conversion_executor.submit(self.convert_video_to_audio, video_path)
+        with self._conversions_lock:
+            self._pending_conversions.append((future, file_info))
+    
+    def wait_for_conversions(self):
+        """
+        Wait for all queued audio conversions and record their results.
+        
+        Returns:
+            int: Number of successful conversions
+        """
+        with self._conversions_lock:
+            pending, self._pending_conversions = self._pending_conversions, []
+        if not pending:
+            return 0
+        
+        self.logger.info(f"Waiting for {len(pending)} audio conversion(s) to finish")
+        wait([future for future, _ in pending])
+        
+        converted = 0
+        for future, file_info in pending:
+            try:
+                audio_path = future.result()
+            except Exception as e:
+                self.logger.error(f"Error during audio conversion: {e}")
+                continue
+            if audio_path:
+                file_info["audio_filename"] = os.path.basename(audio_path)
+                file_info["audio_size_bytes"] = os.path.getsize(audio_path)
+                converted += 1
+        
+        return converted
+    
+    def download_specific_meeting(self, year, category, target_date, wait_for_audio=True, meetings=None):
         """
         Download video from a specific date and category.
         
@@ -671,6 +793,10 @@ class IdahoLegislatureDownloader:
             year (str): Year to download from
             category (str): Category to download from
             target_date (str): Target date (format: "Month Day", e.g., "January 6")
+            wait_for_audio (bool): Wait for audio conversions before returning. When False,
+                conversions keep running in the background until wait_for_conversions() is called.
+            meetings (list, optional): Meetings already fetched for this year and category.
+                If None, the meeting list is fetched from the website.
             
         Returns:
             bool: True if download was successful, False otherwise
@@ -679,17 +805,19 @@ class IdahoLegislatureDownloader:
             os.makedirs(self.output_dir)
         
         try:
-            # Get available meetings for the year and category
-            available_meetings = self.get_all_meetings(year, category)
+            # Get available meetings for the year and category, reusing the caller's list if provided
+            available_meetings = meetings if meetings is not None else self.get_all_meetings(year, category)
             
             if not available_meetings:
                 self.logger.error(f"No meetings available for {year}, {category}")
                 return False
             
-            # Filter for target date
+            # Filter for target date; the day must match exactly, so "January 1"
+            # doesn't also pick up "January 15"
+            date_pattern = re.compile(rf"(?<!\w){re.escape(target_date)}(?!\d)")
             target_meetings = []
             for meeting in available_meetings:
-                if target_date in meeting['date']:
+                if date_pattern.search(meeting['date']):
                     target_meetings.append(meeting)
             
             if not target_meetings:
@@ -780,15 +908,15 @@ class IdahoLegislatureDownloader:
                                 "size_bytes": os.path.getsize(output_path)
                             }
                             
-                            # Convert to audio if requested
+                            # Convert to audio in the background while the next file downloads
                             if self.convert_to_audio and self.ffmpeg_available:
-                                audio_path = self.convert_video_to_audio(output_path)
-                                if audio_path:
-                                    file_info["audio_filename"] = os.path.basename(audio_path)
-                                    file_info["audio_size_bytes"] = os.path.getsize(audio_path)
+                                self._queue_audio_conversion(output_path, file_info)
                             
                             downloaded_files.append(file_info)
                 
+                if wait_for_audio:
+                    self.wait_for_conversions()
+                
                 self.logger.info(f"Completed processing meeting: {safe_title}")
                 return True  # Return after processing one meeting
             
@@ -796,7 +924,6 @@ class IdahoLegislatureDownloader:
         
         except Exception as e:
             self.logger.error(f"Unexpected error: {e}")
-            import traceback
             self.logger.error(traceback.format_exc())
             return False
         
@@ -854,10 +981,42 @@ class IdahoLegislatureDownloader:
             
         except Exception as e:
             self.logger.error(f"Unexpected error getting meetings: {e}")
-            import traceback
             self.logger.error(traceback.format_exc())
             return []
     
+    def _probe_audio_codec(self, video_path):
+        """
+        Get the codec of the first audio stream in a media file using ffprobe.
+        
+        Args:
+            video_path (str): Path to the video file
+            
+        Returns:
+            str: Codec name (e.g. "aac"), or None if it could not be determined
+        """
+        if not _FFPROBE:
+            return None
+        
+        try:
+            process = subprocess.run(
+                [
+                    _FFPROBE, '-v', 'error',
+                    '-select_streams', 'a:0',
+                    '-show_entries', 'stream=codec_name',
+                    '-of', 'default=noprint_wrappers=1:nokey=1',
+                    video_path
+                ],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True
+            )
+            if process.returncode == 0:
+                return process.stdout.strip() or None
+        except Exception as e:
+            self.logger.debug(f"Error probing audio codec for {video_path}: {e}")
+        
+        return None
+    
     def convert_video_to_audio(self, video_path):
         """
         Convert a video file to audio format using ffmpeg.
@@ -889,11 +1048,20 @@ class IdahoLegislatureDownloader:
             self.logger.info(f"Converting {base_name} to {self.audio_format} format...")
             
             # Prepare ffmpeg command
-            cmd = [
-                'ffmpeg',
-                '-i', video_path,
-                '-vn',  # Skip video
-                '-acodec', 'libmp3lame' if self.audio_format == 'mp3' else 'copy',
+            cmd = [_FFMPEG, '-threads', '0', '-i', video_path, '-vn']  # Skip video
+            if self.audio_format == 'mp3':
+                cmd += ['-acodec', 'libmp3lame', '-q:a', '4']
+            elif self.audio_format in ('m4a', 'aac'):
+                if self._probe_audio_codec(video_path) == 'aac':
+                    # Source audio is already AAC, so remux it without re-encoding
+                    cmd += ['-acodec', 'copy']
+                    if self.audio_format == 'm4a':
+                        cmd += ['-movflags', '+faststart']
+                else:
+                    cmd += ['-acodec', 'aac']
+            else:
+                cmd += ['-acodec', 'copy']
+            cmd += [
                 '-y',  # Overwrite output file
                 audio_path
             ]
@@ -937,6 +1105,9 @@ class IdahoLegislatureDownloader:
         if not meetings:
             return 0
         
+        # Keep the full listing so each date lookup below reuses it instead of re-fetching
+        all_meetings = meetings
+        
         if limit:
             meetings = meetings[:limit]
             self.logger.info(f"Limiting to {limit} meetings")
@@ -955,7 +1126,9 @@ class IdahoLegislatureDownloader:
                 target_date = f"{date_parts[0]} {date_parts[1]}"  # e.g., "January 7"
                 
                 # Download the meeting
-                success = self.download_specific_meeting(year, category, target_date)
+                success = self.download_specific_meeting(
+                    year, category, target_date, wait_for_audio=False, meetings=all_meetings
+                )
                 
                 if success:
                     self.logger.info(f"Successfully downloaded {date} - {title}")
@@ -968,5 +1141,8 @@ class IdahoLegislatureDownloader:
             else:
                 self.logger.warning(f"Skipping meeting with invalid date format: {date}")
         
+        # Let any conversions still running on the background worker finish
+        self.wait_for_conversions()
+        
         self.logger.info(f"Completed {year}, {category}. Successfully downloaded {successful_downloads}/{len(meetings)} videos.")
         return successful_downloads
\ No newline at end of file
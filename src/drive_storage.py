@@ -9,6 +9,7 @@ import time
 import json
 import logging
 import mimetypes
+import functools
 from pathlib import Path
 from datetime import datetime
 
@@ -50,6 +51,14 @@ MEDIA_TYPES = {
     'transcript': {'folder': 'Transcripts', 'extensions': ['.txt']}
 }
 
+# Mimetypes for media extensions the system's mimetypes table may not know
+FALLBACK_MIMETYPES = {
+    '.mp4': 'video/mp4',
+    '.mp3': 'audio/mpeg',
+    '.wav': 'audio/wav',
+    '.txt': 'text/plain'
+}
+
 # Local state caching
 folder_cache = {}
 
@@ -272,6 +281,18 @@ def get_or_create_folder_hierarchy(service, folder_path):
     return parent_id
 
 
+@functools.lru_cache(maxsize=64)
+def _mimetype_for_extension(ext):
+    """Get the mimetype for a lowercased file extension, cached since only a few occur."""
+    mimetype, _ = mimetypes.guess_type(f"file{ext}")
+    return mimetype or FALLBACK_MIMETYPES.get(ext, 'application/octet-stream')
+
+
+def get_mimetype(file_path):
+    """Get the upload mimetype for a file based on its extension."""
+    return _mimetype_for_extension(os.path.splitext(file_path)[1].lower())
+
+
 def upload_file(file_path, media_type=None, custom_folder_path=None):
     """
     Upload a file to Google Drive.
@@ -308,20 +329,7 @@ def upload_file(file_path, media_type=None, custom_folder_path=None):
         }
         
         # Get mimetype
-        mimetype, _ = mimetypes.guess_type(file_path)
-        if not mimetype:
-            # Fallback mimetypes
-            ext = os.path.splitext(file_path)[1].lower()
-            if ext == '.mp4':
-                mimetype = 'video/mp4'
-            elif ext == '.mp3':
-                mimetype = 'audio/mpeg'
-            elif ext == '.wav':
-                mimetype = 'audio/wav'
-            elif ext == '.txt':
-                mimetype = 'text/plain'
-            else:
-                mimetype = 'application/octet-stream'
+        mimetype = get_mimetype(file_path)
         
         # Prepare media
         media = MediaFileUpload(
@@ -524,19 +532,7 @@ def update_file(file_id, file_path):
         service = get_drive_service()
         
         # Get mimetype
-        mimetype, _ = mimetypes.guess_type(file_path)
-        if not mimetype:
-            ext = os.path.splitext(file_path)[1].lower()
-            if ext == '.mp4':
-                mimetype = 'video/mp4'
-            elif ext == '.mp3':
-                mimetype = 'audio/mpeg'
-            elif ext == '.wav':
-                mimetype = 'audio/wav'
-            elif ext == '.txt':
-                mimetype = 'text/plain'
-            else:
-                mimetype = 'application/octet-stream'
+        mimetype = get_mimetype(file_path)
         
         # Prepare media
         media = MediaFileUpload(
@@ -23,8 +23,10 @@ This allows for efficient scaling and reduced local storage requirements.
 """
 
 import os
+import time
 import logging
 import tempfile
+import threading
 from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.responses import FileResponse, RedirectResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
@@ -36,7 +38,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # Try to import the GCS and secrets modules, but don't fail if they're not available
 try:
-    from src.cloud_storage import get_default_gcs_client
+    from src.cloud_storage import get_default_gcs_client, LIST_BLOB_NAME_FIELDS
     from src.secrets_manager import get_cloud_storage_settings
     gcs_available = True
 except ImportError as e:
@@ -72,6 +74,12 @@ TEMP_DIR = os.path.join(DATA_DIR, 'temp')
 os.makedirs(DOWNLOADS_DIR, exist_ok=True)
 os.makedirs(TEMP_DIR, exist_ok=True)
 
+# Seconds a year/category listing of the bucket is reused across requests
+GCS_LISTING_TTL = 60
+# Prefix -> (expiry, set of object names) for recent bucket listings
+_gcs_listings = {}
+_gcs_listings_lock = threading.Lock()
+
 # Initialize GCS client if available
 gcs_client = None
 if gcs_available:
@@ -165,6 +173,30 @@ def find_local_file(year, category, filename):
     
     return None
 
+def list_cloud_storage_names(prefix):
+    """
+    List the object names under a GCS prefix, reusing a recent listing.
+    
+    A page of media players requests many files from the same year/category
+    folder, so one listing serves all of them for GCS_LISTING_TTL seconds.
+    
+    Args:
+        prefix: Object name prefix to list
+        
+    Returns:
+        set: Names of the objects under the prefix
+    """
+    with _gcs_listings_lock:
+        entry = _gcs_listings.get(prefix)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+    
+    # Only names are requested, not the full object metadata
+    names = {blob.name for blob in gcs_client.bucket.list_blobs(prefix=prefix, fields=LIST_BLOB_NAME_FIELDS)}
+    with _gcs_listings_lock:
+        _gcs_listings[prefix] = (time.monotonic() + GCS_LISTING_TTL, names)
+    return names
+
 def search_cloud_storage(year, category, filename):
     """
     Search for a file in Google Cloud Storage.
@@ -188,13 +220,15 @@ def search_cloud_storage(year, category, filename):
     if blob.exists():
         return True, direct_path
     
-    # Try to list files in the year/category prefix to find session folders
-    blobs = list(gcs_client.bucket.list_blobs(prefix=f"{year}/{category}/"))
+    # List the year/category prefix once; the listing already names every object
+    # under the session folders, so candidates are checked against it instead of
+    # probing each one with its own exists() request
+    blob_names = list_cloud_storage_names(f"{year}/{category}/")
     session_prefixes = set()
     
-    for blob in blobs:
+    for name in blob_names:
         # Extract session folder from path like "2025/House Chambers/January 9, 2025_Legislative Session Day 4/..."
-        parts = blob.name.split('/')
+        parts = name.split('/')
         if len(parts) >= 3:
             session_prefixes.add(f"{year}/{category}/{parts[2]}/")
     
@@ -202,14 +236,12 @@ def search_cloud_storage(year, category, filename):
     for prefix in session_prefixes:
         # Try in main session directory
         path = f"{prefix}{filename}"
-        blob = gcs_client.bucket.blob(path)
-        if blob.exists():
+        if path in blob_names:
             return True, path
         
         # Try in audio subdirectory
         audio_path = f"{prefix}audio/{filename}"
-        blob = gcs_client.bucket.blob(audio_path)
-        if blob.exists():
+        if audio_path in blob_names:
             return True, audio_path
     
     return False, None
@@ -5,11 +5,16 @@ Replacement for the transcript_db.py module, using Firestore instead of SQLite.
 """
 
 import os
+import re
 import sys
+import asyncio
+import functools
+import itertools
 import logging
-from datetime import datetime
-from google.cloud import firestore
-from google.cloud.firestore_v1.base_query import FieldFilter
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 
 # Add project root to path for imports
 base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -21,23 +26,140 @@ logs_dir = os.path.join(base_dir, 'data', 'logs')
 # Create directories if they don't exist
 os.makedirs(logs_dir, exist_ok=True)
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(os.path.join(logs_dir, 'firestore_db.log')),
-        logging.StreamHandler()
-    ]
-)
+# Configure logging, unless an importing module already has (basicConfig would
+# ignore the handlers, but only after the log file had been opened for them)
+if not logging.getLogger().handlers:
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(os.path.join(logs_dir, 'firestore_db.log')),
+            logging.StreamHandler()
+        ]
+    )
 
 logger = logging.getLogger('firestore_db')
 
+# Number of Firestore clients (each with its own gRPC channel) shared per project.
+# Requests are spread across them so concurrent fan-out isn't capped by the
+# stream limit of a single HTTP/2 connection. Each extra channel costs a TLS
+# handshake and auth setup on first use, so keep the pool small.
+FIRESTORE_CLIENT_POOL_SIZE = int(os.environ.get('FIRESTORE_CLIENT_POOL_SIZE', '4'))
+
+# Shared pool for fanning per-collection queries out concurrently. Sized so a
+# full search fan-out (three queries for each of the four collections) from a
+# few concurrent requests runs without queueing behind the pool.
+QUERY_WORKERS = int(os.environ.get('FIRESTORE_QUERY_WORKERS', str(8 * max(1, FIRESTORE_CLIENT_POOL_SIZE))))
+_QUERY_EXECUTOR = ThreadPoolExecutor(max_workers=QUERY_WORKERS, thread_name_prefix='firestore-query')
+
+# How long (seconds) cached filter options and statistics stay fresh
+FILTER_OPTIONS_CACHE_TTL = 300
+STATISTICS_CACHE_TTL = 60
+
+# Media collections, in the order results are returned
+MEDIA_COLLECTIONS = ('videos', 'audio', 'transcripts', 'other')
+_VALID_COLLECTIONS = frozenset(MEDIA_COLLECTIONS)
+
+# Collections queried for each media_type filter; other values query all collections
+_MEDIA_TYPE_COLLECTIONS = {
+    'video': ('videos',),
+    'audio': ('audio',),
+    'transcript': ('transcripts',),
+}
+
+# Firestore's limit on writes per WriteBatch commit
+MAX_BATCH_SIZE = 500
+
+# Fields search_media matches against, always fetched even with a projection
+SEARCH_FIELDS = frozenset(('session_name', 'category', 'year', 'session_name_lc', 'category_lc'))
 
+# Normalized fields written alongside each record for server-side search
+SEARCH_INDEX_FIELDS = ('session_name_lc', 'category_lc', 'search_tokens')
+
+# Lowercased fields search_media also matches by prefix with a range query
+SEARCH_PREFIX_FIELDS = ('session_name_lc', 'category_lc')
+
+# Word pattern used to tokenize searchable text
+_SEARCH_TOKEN_PATTERN = re.compile(r'\w+')
+
+# Service account key files used when GOOGLE_APPLICATION_CREDENTIALS isn't set, in order
+CREDENTIAL_PATHS = (
+    os.path.join(base_dir, 'credentials', 'legislativevideoreviewswithai-80ed70b021b5.json'),
+    "/Users/ryangravette/Downloads/legislativevideoreviewswithai-firebase-adminsdk-fbsvc-f12bbdca43.json",
+)
+
+# Document holding the distinct years and categories, maintained at write time
+FILTER_OPTIONS_DOC = '_meta/filter_options'
+
+
+@functools.lru_cache(maxsize=1)
+def _firestore():
+    """
+    Import the Firestore SDK on first use.
+    
+    google.cloud.firestore pulls in gRPC, protobuf and google-auth, so importing it
+    lazily keeps callers that never touch the database (scripts using
+    get_firebase_project_id, the API's startup path) from paying for it.
+    
+    Returns:
+        module: google.cloud.firestore
+    """
+    from google.cloud import firestore
+    return firestore
+
+
+def _field_filter(field_path, op_string, value):
+    """
+    Build a Firestore FieldFilter, importing the SDK on first use.
+    
+    Args:
+        field_path (str): Field to filter on
+        op_string (str): Comparison operator
+        value: Value to compare against
+        
+    Returns:
+        FieldFilter: Filter for Query.where()
+    """
+    from google.cloud.firestore_v1.base_query import FieldFilter
+    return FieldFilter(field_path, op_string, value)
+
+
+@functools.lru_cache(maxsize=1)
+def _retry_policy():
+    """
+    Get the retry policy for transient Firestore errors (UNAVAILABLE, DEADLINE_EXCEEDED, etc.).
+    
+    Returns:
+        google.api_core.retry.Retry: Shared retry policy
+    """
+    from google.api_core import retry
+    return retry.Retry(predicate=retry.if_transient_error, initial=0.5, maximum=8, multiplier=2, deadline=60)
+
+
+@functools.lru_cache(maxsize=1)
+def _async_retry_policy():
+    """
+    Get the retry policy for transient errors on the async Firestore client.
+    
+    Same predicate and backoff as _retry_policy; the async client needs an
+    AsyncRetry so that it awaits the retried calls.
+    
+    Returns:
+        google.api_core.retry_async.AsyncRetry: Shared retry policy
+    """
+    from google.api_core import retry, retry_async
+    return retry_async.AsyncRetry(predicate=retry.if_transient_error, initial=0.5, maximum=8, multiplier=2, deadline=60)
+
+
+@functools.lru_cache(maxsize=1)
 def get_firebase_project_id():
     """
     Get the Firebase project ID from environment or configuration.
     
+    The lookup (which may query application default credentials) runs once per
+    process; later calls return the cached result, so changing
+    GOOGLE_CLOUD_PROJECT after the first call has no effect.
+    
     Returns:
         str: Firebase project ID
     """
@@ -60,13 +182,7 @@ def get_firebase_project_id():
     # Set the environment variable for the service account if needed
     if not os.environ.get('GOOGLE_APPLICATION_CREDENTIALS'):
         # Check for credentials in multiple locations
-        possible_paths = [
-            os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
-                         'credentials', 'legislativevideoreviewswithai-80ed70b021b5.json'),
-            "/Users/ryangravette/Downloads/legislativevideoreviewswithai-firebase-adminsdk-fbsvc-f12bbdca43.json"
-        ]
-        
-        for path in possible_paths:
+        for path in CREDENTIAL_PATHS:
             if os.path.exists(path):
                 os.environ['GOOGLE_APPLICATION_CREDENTIALS'] = path
                 logger.info(f"Set GOOGLE_APPLICATION_CREDENTIALS to {path}")
@@ -75,6 +191,147 @@ def get_firebase_project_id():
     return project_id
 
 
+# Firestore client pools shared by every FirestoreDB instance, keyed by project ID
+_CLIENTS = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def get_firestore_clients(project_id):
+    """
+    Get the process-wide pool of Firestore clients for a project, creating it on first use.
+    
+    Sharing the pool keeps its gRPC channels alive, so concurrent requests are
+    multiplexed over them instead of each instance paying for channel setup.
+    
+    Args:
+        project_id (str): Firebase project ID
+        
+    Returns:
+        tuple: FIRESTORE_CLIENT_POOL_SIZE shared firestore.Client objects
+    """
+    with _CLIENTS_LOCK:
+        clients = _CLIENTS.get(project_id)
+        if clients is None:
+            firestore = _firestore()
+            clients = tuple(
+                firestore.Client(project=project_id)
+                for _ in range(max(1, FIRESTORE_CLIENT_POOL_SIZE))
+            )
+            _CLIENTS[project_id] = clients
+            logger.info(f"Initialized {len(clients)} Firestore clients for project: {project_id}")
+        return clients
+
+
+def get_firestore_client(project_id):
+    """
+    Get a shared Firestore client for a project.
+    
+    Args:
+        project_id (str): Firebase project ID
+        
+    Returns:
+        firestore.Client: First client of the project's shared pool
+    """
+    return get_firestore_clients(project_id)[0]
+
+
+def close_firestore_clients():
+    """Close all shared Firestore clients and their gRPC channels."""
+    with _CLIENTS_LOCK:
+        for clients in _CLIENTS.values():
+            for client in clients:
+                client.close()
+        _CLIENTS.clear()
+
+
+def tokenize_search_text(text):
+    """
+    Split text into lowercased word tokens for array-contains search.
+    
+    Args:
+        text (str): Text to tokenize
+        
+    Returns:
+        list: Sorted unique tokens
+    """
+    return sorted(set(_SEARCH_TOKEN_PATTERN.findall(str(text or '').lower())))
+
+
+@functools.lru_cache(maxsize=4096)
+def _search_field_values(session_name, category):
+    """
+    Compute the normalized search fields for a session name and category.
+    
+    Records of one session (its video, audio and transcripts) share both values,
+    so bulk writes and backfills hit the cache for all but the first of them.
+    
+    Args:
+        session_name (str): Session name
+        category (str): Category
+        
+    Returns:
+        tuple: (session_name_lc, category_lc, search_tokens tuple)
+    """
+    return (
+        session_name.lower(),
+        category.lower(),
+        tuple(tokenize_search_text(f"{session_name} {category}"))
+    )
+
+
+def doc_to_data(doc, collection):
+    """
+    Convert a document snapshot to its data, tagged with its collection name and ID.
+    
+    Args:
+        doc: Firestore document snapshot
+        collection (str): Collection the document belongs to
+        
+    Returns:
+        dict: Document data with _collection and _id set
+    """
+    data = doc.to_dict()
+    data['_collection'] = collection
+    data['_id'] = doc.id
+    return data
+
+
+def _has_search_text(data):
+    """
+    Check whether data carries every field the search fields are derived from.
+    
+    Args:
+        data (dict): Media data
+        
+    Returns:
+        bool: True if both session_name and category are present
+    """
+    return 'session_name' in data and 'category' in data
+
+
+def add_search_fields(data):
+    """
+    Add the normalized search fields derived from session_name and category.
+    
+    Stores lowercased copies of both fields and a search_tokens array so that
+    search_media can filter server-side with an array-contains query.
+    
+    Args:
+        data (dict): Media data, updated in place
+        
+    Returns:
+        dict: The same data dict
+    """
+    session_name_lc, category_lc, search_tokens = _search_field_values(
+        str(data.get('session_name') or ''),
+        str(data.get('category') or '')
+    )
+    data['session_name_lc'] = session_name_lc
+    data['category_lc'] = category_lc
+    data['search_tokens'] = list(search_tokens)
+    return data
+
+
 class FirestoreDB:
     """
     Firestore database client for accessing media data.
@@ -89,87 +346,299 @@ class FirestoreDB:
             project_id (str, optional): Firebase project ID. If None, tries to get from environment.
         """
         self.project_id = project_id or get_firebase_project_id()
-        self.client = None
+        self._clients = ()
+        # Cycles through (client, {collection name: CollectionReference}) for each pooled client
+        self._client_pool = None
+        self._cache = {}
+        self._cache_lock = threading.Lock()
+        # Years and categories known to be in the filter options document, trusted
+        # until _known_expires so that changes made elsewhere are picked up
+        self._known_years = set()
+        self._known_categories = set()
+        self._known_expires = 0.0
         self._initialize_client()
     
     def _initialize_client(self):
-        """Initialize the Firestore client."""
+        """Initialize the Firestore client pool."""
         try:
-            self.client = firestore.Client(project=self.project_id)
-            logger.info(f"Initialized Firestore client for project: {self.project_id}")
+            self._clients = get_firestore_clients(self.project_id)
+            self._client_pool = itertools.cycle([
+                (client, {collection: client.collection(collection) for collection in MEDIA_COLLECTIONS})
+                for client in self._clients
+            ])
         except Exception as e:
             logger.error(f"Failed to initialize Firestore client: {e}")
             raise
     
-    def get_all_media(self, media_type=None, limit=None):
+    @property
+    def client(self):
+        """
+        Firestore client to issue the next request with.
+        
+        Rotates through the shared pool, so the queries of one fan-out run on
+        separate gRPC channels.
+        
+        Returns:
+            firestore.Client: Shared Firestore client
+        """
+        return self._next_client()[0]
+    
+    def _next_client(self):
+        """
+        Pick the pooled client for one operation.
+        
+        Operations that combine several references (get_all, batches,
+        transactions) take one pair here and build every reference from it, so
+        they never mix references from different clients.
+        
+        Returns:
+            tuple: (firestore.Client, {collection name: CollectionReference})
+        """
+        return next(self._client_pool)
+    
+    def _collection(self, collection, pooled=None):
+        """
+        Reference to a collection on a pooled client.
+        
+        Media collection references are built once per client rather than on
+        every query.
+        
+        Args:
+            collection (str): Collection name
+            pooled (tuple, optional): Pair from _next_client to build the reference
+                from; defaults to the next client in the pool
+            
+        Returns:
+            CollectionReference: Collection reference
+        """
+        client, collections = pooled or self._next_client()
+        return collections.get(collection) or client.collection(collection)
+    
+    def _get_cached(self, key):
+        """
+        Get a cached value if it hasn't expired.
+        
+        Args:
+            key (str): Cache key
+            
+        Returns:
+            The cached value, or None if missing or expired
+        """
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry and entry[0] > time.monotonic():
+                return entry[1]
+        return None
+    
+    def _set_cached(self, key, value, ttl):
+        """
+        Cache a value for ttl seconds.
+        
+        Args:
+            key (str): Cache key
+            value: Value to cache
+            ttl (float): Time to live in seconds
+            
+        Returns:
+            The cached value
+        """
+        with self._cache_lock:
+            self._cache[key] = (time.monotonic() + ttl, value)
+        return value
+    
+    def invalidate_cache(self):
+        """Drop cached filter options and statistics so the next read refetches them."""
+        with self._cache_lock:
+            self._cache.clear()
+    
+    def _fetch_collection(self, collection, query):
+        """
+        Execute a query and tag each result with its collection name and document ID.
+        
+        Args:
+            collection (str): Collection name the query targets
+            query: Firestore query to execute
+            
+        Returns:
+            list: List of document data
+        """
+        # get() fetches the whole result set as one retryable call, unlike stream()
+        # which can't be retried once results have started arriving
+        docs = query.get(retry=_retry_policy())
+        return [doc_to_data(doc, collection) for doc in docs]
+    
+    def _fetch_queries(self, queries):
+        """
+        Execute several queries concurrently.
+        
+        The RPCs run on a shared thread pool, so total latency is that of the
+        slowest query rather than the sum of all of them.
+        
+        Args:
+            queries (list): (collection, query) pairs
+            
+        Returns:
+            list: Document data from all queries, in query order
+        """
+        futures = [
+            _QUERY_EXECUTOR.submit(self._fetch_collection, collection, query)
+            for collection, query in queries
+        ]
+        results = []
+        for future in futures:
+            results.extend(future.result())
+        return results
+    
+    def _fetch_collections(self, collections, build_query):
+        """
+        Query several collections concurrently.
+        
+        Args:
+            collections (list): Collection names to query
+            build_query (callable): Function mapping a collection name to its query
+            
+        Returns:
+            list: Document data from all collections, in collection order
+        """
+        return self._fetch_queries([(collection, build_query(collection)) for collection in collections])
+    
+    def _iter_collection(self, collection, query, chunk_size):
+        """
+        Page through a query in document ID order, yielding one record at a time.
+        
+        Each page is a separate retryable get(), so only chunk_size documents are
+        held in memory and the caller can stop early without reading the rest.
+        
+        Args:
+            collection (str): Collection name the query targets
+            query: Firestore query to page through
+            chunk_size (int): Number of documents fetched per page
+            
+        Yields:
+            dict: Document data tagged with _collection and _id
+        """
+        query = query.order_by('__name__').limit(chunk_size)
+        last_id = None
+        while True:
+            page = query.start_after({'__name__': last_id}) if last_id else query
+            docs = page.get(retry=_retry_policy())
+            for doc in docs:
+                yield doc_to_data(doc, collection)
+            if len(docs) < chunk_size:
+                return
+            last_id = docs[-1].id
+    
+    def iter_all_media(self, media_type=None, fields=None, chunk_size=MAX_BATCH_SIZE):
+        """
+        Iterate over all media records without loading them into memory at once.
+        
+        Collections are read one after another, in collection order.
+        
+        Args:
+            media_type (str, optional): Filter by media type ('video', 'audio', 'transcript')
+            fields (list, optional): Only fetch these fields instead of whole documents
+            chunk_size (int): Number of documents fetched per page
+            
+        Yields:
+            dict: Document data
+        """
+        for collection in _MEDIA_TYPE_COLLECTIONS.get(media_type, MEDIA_COLLECTIONS):
+            query = self._collection(collection)
+            if fields:
+                query = query.select(list(fields))
+            yield from self._iter_collection(collection, query, chunk_size)
+    
+    def get_all_media(self, media_type=None, limit=None, fields=None, year=None, category=None):
         """
         Get all media records from Firestore.
         
         Args:
             media_type (str, optional): Filter by media type ('video', 'audio', 'transcript')
             limit (int, optional): Maximum number of records to return
+            fields (list, optional): Only fetch these fields instead of whole documents
+            year (str, optional): Filter by year
+            category (str, optional): Filter by category
             
         Returns:
             list: List of Firestore document snapshots
         """
-        results = []
-        collections = []
-        
         # Determine which collections to query
-        if media_type == 'video':
-            collections = ['videos']
-        elif media_type == 'audio':
-            collections = ['audio']
-        elif media_type == 'transcript':
-            collections = ['transcripts']
-        else:
-            collections = ['videos', 'audio', 'transcripts', 'other']
-        
-        # Query each collection
-        for collection in collections:
-            query = self.client.collection(collection)
+        collections = _MEDIA_TYPE_COLLECTIONS.get(media_type, MEDIA_COLLECTIONS)
+        
+        def build_query(collection):
+            query = self._collection(collection)
+            if year:
+                query = query.where(filter=_field_filter("year", "==", year))
+            if category:
+                query = query.where(filter=_field_filter("category", "==", category))
+            if fields:
+                query = query.select(list(fields))
             if limit:
                 query = query.limit(limit)
-            
-            # Execute query and add results
-            docs = list(query.stream())
-            for doc in docs:
-                # Add collection name and document ID to the data
-                data = doc.to_dict()
-                data['_collection'] = collection
-                data['_id'] = doc.id
-                results.append(data)
+            return query
         
-        return results
+        # Query all collections concurrently
+        return self._fetch_collections(collections, build_query)
     
-    def get_media_by_id(self, media_id, collection=None):
+    def get_media_by_id(self, media_id, collection=None, fields=None):
         """
         Get a specific media record by ID.
         
         Args:
             media_id (str): Document ID
             collection (str, optional): Collection name. If None, searches all collections.
+            fields (list, optional): Only fetch these fields instead of the whole document
             
         Returns:
             dict: Document data or None if not found
         """
-        if collection:
-            collections = [collection]
-        else:
-            collections = ['videos', 'audio', 'transcripts', 'other']
+        collections = (collection,) if collection else MEDIA_COLLECTIONS
+        
+        # Fetch the candidate documents from every collection in a single batched RPC
+        pooled = self._next_client()
+        refs = [self._collection(coll, pooled).document(media_id) for coll in collections]
+        found = {
+            doc.reference.parent.id: doc
+            for doc in pooled[0].get_all(
+                refs,
+                field_paths=list(fields) if fields else None,
+                retry=_retry_policy()
+            )
+            if doc.exists
+        }
         
+        # Return the first match in collection order
         for coll in collections:
-            doc_ref = self.client.collection(coll).document(media_id)
-            doc = doc_ref.get()
-            if doc.exists:
-                data = doc.to_dict()
-                data['_collection'] = coll
-                data['_id'] = doc.id
-                return data
+            doc = found.get(coll)
+            if doc:
+                return doc_to_data(doc, coll)
         
         return None
     
-    def search_media(self, query_text, media_type=None, year=None, category=None, limit=100):
+    def get_media_by_path(self, file_path, collections=MEDIA_COLLECTIONS):
+        """
+        Get the media record for a local file path.
+        
+        The collections are queried concurrently, so a lookup takes one round
+        trip however many collections have to be checked.
+        
+        Args:
+            file_path (str): Original local path of the file
+            collections (tuple): Collections to search, in order of preference
+            
+        Returns:
+            dict: Document data from the first collection with a match, or None
+        """
+        def build_query(collection):
+            return self._collection(collection).where(
+                filter=_field_filter("original_path", "==", file_path)
+            ).limit(1)
+        
+        # Results come back in collection order, so the first is the preferred match
+        results = self._fetch_collections(collections, build_query)
+        return results[0] if results else None
+    
+    def search_media(self, query_text, media_type=None, year=None, category=None, limit=100, fields=None):
         """
         Search for media records by text, year, category, etc.
         
@@ -179,54 +648,157 @@ class FirestoreDB:
             year (str, optional): Filter by year
             category (str, optional): Filter by category
             limit (int, optional): Maximum number of results
+            fields (list, optional): Only fetch these fields instead of whole documents.
+                The searched fields (session_name, category, year and their lowercased
+                copies) are always included.
             
         Returns:
             list: List of matching document data
         """
         results = []
-        collections = []
         
         # Determine which collections to query
-        if media_type == 'video':
-            collections = ['videos']
-        elif media_type == 'audio':
-            collections = ['audio']
-        elif media_type == 'transcript':
-            collections = ['transcripts']
-        else:
-            collections = ['videos', 'audio', 'transcripts', 'other']
-        
-        # Query each collection
-        for collection in collections:
-            query = self.client.collection(collection)
+        collections = _MEDIA_TYPE_COLLECTIONS.get(media_type, MEDIA_COLLECTIONS)
+        
+        q = query_text.lower()
+        
+        # Narrow candidates server-side on the query's most selective word token;
+        # the full query text is still matched against each candidate below
+        tokens = tokenize_search_text(query_text)
+        search_token = max(tokens, key=len) if tokens else None
+        
+        def build_query(collection):
+            query = self._collection(collection)
             
             # Apply filters
             if year:
-                query = query.where(filter=FieldFilter("year", "==", year))
+                query = query.where(filter=_field_filter("year", "==", year))
             if category:
-                query = query.where(filter=FieldFilter("category", "==", category))
+                query = query.where(filter=_field_filter("category", "==", category))
+            if fields:
+                query = query.select(sorted(set(fields) | SEARCH_FIELDS))
             
-            # Execute query and add results
-            docs = list(query.limit(limit).stream())
+            return query
+        
+        queries = []
+        for collection in collections:
+            query = build_query(collection)
+            if not q:
+                queries.append((collection, query.limit(limit)))
+                continue
             
-            # Filter by query text manually (since Firestore doesn't support full-text search)
-            for doc in docs:
-                data = doc.to_dict()
-                session_name = data.get('session_name', '').lower()
-                category_name = data.get('category', '').lower()
-                
-                if (query_text.lower() in session_name or 
-                    query_text.lower() in category_name):
-                    # Add collection name and document ID to the data
-                    data['_collection'] = collection
-                    data['_id'] = doc.id
-                    results.append(data)
+            # Records containing the query's most selective whole word
+            if search_token:
+                queries.append((collection, query.where(
+                    filter=_field_filter("search_tokens", "array_contains", search_token)
+                ).limit(limit)))
+            
+            # Records whose session name or category starts with the query, which
+            # also catches a partially typed last word
+            for field in SEARCH_PREFIX_FIELDS:
+                queries.append((collection, query.where(
+                    filter=_field_filter(field, ">=", q)
+                ).where(
+                    filter=_field_filter(field, "<", q + '\uf8ff')
+                ).limit(limit)))
+        
+        # Run all queries concurrently
+        docs = self._fetch_queries(queries)
+        
+        # Filter by the full query text (Firestore doesn't support substring search),
+        # matching against the fields lowercased at write time. A record can be
+        # returned by more than one of its collection's queries, so skip repeats.
+        seen = set()
+        for data in docs:
+            key = (data['_collection'], data['_id'])
+            if key in seen:
+                continue
+            seen.add(key)
+            
+            session_name = data.get('session_name_lc')
+            if session_name is None:
+                session_name = (data.get('session_name') or '').lower()
+            category_name = data.get('category_lc')
+            if category_name is None:
+                category_name = (data.get('category') or '').lower()
+            
+            if q in session_name or q in category_name:
+                results.append(data)
         
         return results[:limit]
     
-    def get_filter_options(self):
+    def _record_filter_options(self, records, writes=(), client=None):
         """
-        Get available filter options (years and categories).
+        Add any new years and categories from the records to the filter options document.
+        
+        Values this instance already knows are stored are skipped, so the common
+        case costs no extra RPC; that knowledge expires after
+        FILTER_OPTIONS_CACHE_TTL seconds, like the cached options. New values are merged into the stored sorted
+        lists inside a transaction, keeping them sorted for get_filter_options.
+        
+        Args:
+            records (iterable): Media data dicts
+            writes (iterable): (operation, doc_ref, data) tuples for the records
+                themselves. They are committed together with the filter options
+                when those change, and on their own otherwise.
+            client (firestore.Client, optional): Client the write references were
+                built from; the transaction runs on it too
+        """
+        client = client or self.client
+        years = set()
+        categories = set()
+        for data in records:
+            if data.get('year'):
+                years.add(data['year'])
+            if data.get('category'):
+                categories.add(data['category'])
+        
+        with self._cache_lock:
+            if self._known_expires > time.monotonic():
+                years -= self._known_years
+                categories -= self._known_categories
+        if not years and not categories:
+            for operation, doc_ref, data in writes:
+                getattr(doc_ref, operation)(data, retry=_retry_policy())
+            return
+        
+        meta_ref = client.document(FILTER_OPTIONS_DOC)
+        
+        @_firestore().transactional
+        def merge_options(transaction):
+            snapshot = meta_ref.get(transaction=transaction)
+            current = snapshot.to_dict() if snapshot.exists else {}
+            options = {
+                'years': sorted(years.union(current.get('years', []))),
+                'categories': sorted(categories.union(current.get('categories', [])))
+            }
+            for operation, doc_ref, data in writes:
+                getattr(transaction, operation)(doc_ref, data)
+            transaction.set(meta_ref, options)
+            return options
+        
+        options = merge_options(client.transaction())
+        self._set_known_options(options['years'], options['categories'])
+    
+    def _set_known_options(self, years, categories):
+        """
+        Replace the years and categories known to be in the filter options document.
+        
+        Args:
+            years (iterable): Years stored in the document
+            categories (iterable): Categories stored in the document
+        """
+        with self._cache_lock:
+            self._known_years = set(years)
+            self._known_categories = set(categories)
+            self._known_expires = time.monotonic() + FILTER_OPTIONS_CACHE_TTL
+    
+    def rebuild_filter_options(self):
+        """
+        Rebuild the filter options document by scanning every media collection.
+        
+        Only needed once for records written before the document existed, or to
+        drop values whose last record has been deleted.
         
         Returns:
             dict: Dictionary with years and categories
@@ -234,47 +806,92 @@ class FirestoreDB:
         years = set()
         categories = set()
         
-        collections = ['videos', 'audio', 'transcripts', 'other']
+        def build_query(collection):
+            return self._collection(collection).select(['year', 'category'])
         
-        for collection in collections:
-            # Get years
-            year_query = self.client.collection(collection).select(['year'])
-            for doc in year_query.stream():
-                data = doc.to_dict()
-                if 'year' in data and data['year']:
-                    years.add(data['year'])
-            
-            # Get categories
-            category_query = self.client.collection(collection).select(['category'])
-            for doc in category_query.stream():
-                data = doc.to_dict()
-                if 'category' in data and data['category']:
-                    categories.add(data['category'])
-        
-        return {
-            'years': sorted(list(years)),
-            'categories': sorted(list(categories))
+        for data in self._fetch_collections(MEDIA_COLLECTIONS, build_query):
+            if data.get('year'):
+                years.add(data['year'])
+            if data.get('category'):
+                categories.add(data['category'])
+        
+        options = {
+            'years': sorted(years),
+            'categories': sorted(categories)
+        }
+        self.client.document(FILTER_OPTIONS_DOC).set(options, retry=_retry_policy())
+        self._set_known_options(years, categories)
+        logger.info(f"Rebuilt filter options: {len(years)} years, {len(categories)} categories")
+        return options
+    
+    def get_filter_options(self):
+        """
+        Get available filter options (years and categories).
+        
+        Reads the single filter options document kept up to date (and sorted) by
+        the write methods, rebuilding it from the media collections if it doesn't
+        exist yet.
+        
+        Returns:
+            dict: Dictionary with years and categories
+        """
+        cached = self._get_cached('filter_options')
+        if cached is not None:
+            return cached
+        
+        doc = self.client.document(FILTER_OPTIONS_DOC).get(retry=_retry_policy())
+        if not doc.exists:
+            return self._set_cached('filter_options', self.rebuild_filter_options(), FILTER_OPTIONS_CACHE_TTL)
+        
+        data = doc.to_dict()
+        options = {
+            'years': data.get('years', []),
+            'categories': data.get('categories', [])
         }
+        self._set_known_options(options['years'], options['categories'])
+        return self._set_cached('filter_options', options, FILTER_OPTIONS_CACHE_TTL)
     
-    def get_statistics(self):
+    def _count_collection(self, collection):
+        """
+        Count the documents in a collection with a server-side COUNT aggregation.
+        
+        Args:
+            collection (str): Collection name
+            
+        Returns:
+            int: Number of documents in the collection
+        """
+        result = self._collection(collection).count().get()
+        return result[0][0].value
+    
+    def get_statistics(self, refresh=False):
         """
         Get statistics about the available media.
         
+        Args:
+            refresh (bool): Recount instead of returning counts cached within
+                the last STATISTICS_CACHE_TTL seconds
+        
         Returns:
             dict: Dictionary with media counts
         """
-        video_count = len(list(self.client.collection('videos').limit(1000).stream()))
-        audio_count = len(list(self.client.collection('audio').limit(1000).stream()))
-        transcript_count = len(list(self.client.collection('transcripts').limit(1000).stream()))
-        other_count = len(list(self.client.collection('other').limit(1000).stream()))
+        cached = None if refresh else self._get_cached('statistics')
+        if cached is not None:
+            return cached
         
-        return {
+        # Count all collections concurrently
+        video_count, audio_count, transcript_count, other_count = _QUERY_EXECUTOR.map(
+            self._count_collection,
+            MEDIA_COLLECTIONS
+        )
+        
+        return self._set_cached('statistics', {
             'total': video_count + audio_count + transcript_count + other_count,
             'videos': video_count,
             'audio': audio_count,
             'transcripts': transcript_count,
             'other': other_count
-        }
+        }, STATISTICS_CACHE_TTL)
     
     def add_media(self, data, collection):
         """
@@ -287,18 +904,24 @@ class FirestoreDB:
         Returns:
             tuple: (bool, str) - Success status and document ID
         """
-        if collection not in ['videos', 'audio', 'transcripts', 'other']:
+        if collection not in _VALID_COLLECTIONS:
             logger.error(f"Invalid collection: {collection}")
             return False, None
         
         # Add timestamps
-        data['created_at'] = datetime.now()
-        data['updated_at'] = datetime.now()
+        now = datetime.now(timezone.utc)
+        data['created_at'] = now
+        data['updated_at'] = now
+        
+        # Add normalized fields for server-side search
+        add_search_fields(data)
         
         try:
-            # Add the document
-            doc_ref = self.client.collection(collection).document()
-            doc_ref.set(data)
+            # Add the document, in the same commit as any filter options it introduces
+            pooled = self._next_client()
+            doc_ref = self._collection(collection, pooled).document()
+            self._record_filter_options([data], writes=[('set', doc_ref, data)], client=pooled[0])
+            self.invalidate_cache()
             logger.info(f"Added new {collection} record: {doc_ref.id}")
             return True, doc_ref.id
         
@@ -306,6 +929,35 @@ class FirestoreDB:
             logger.error(f"Error adding {collection} record: {e}")
             return False, None
     
+    def create_media(self, doc_id, data, collection):
+        """
+        Create a media record under a caller-chosen document ID.
+        
+        Unlike add_media this fails rather than overwriting when the ID is
+        already taken, and errors are raised instead of logged.
+        
+        Args:
+            doc_id (str): Document ID
+            data (dict): Media data, updated in place with the search fields
+            collection (str): Collection name
+            
+        Raises:
+            ValueError: If the collection is not a media collection
+            google.api_core.exceptions.AlreadyExists: If the document exists
+        """
+        if collection not in _VALID_COLLECTIONS:
+            raise ValueError(f"Invalid collection: {collection}")
+        
+        # Add normalized fields for server-side search
+        add_search_fields(data)
+        
+        # Create the document, in the same commit as any filter options it introduces
+        pooled = self._next_client()
+        doc_ref = self._collection(collection, pooled).document(doc_id)
+        self._record_filter_options([data], writes=[('create', doc_ref, data)], client=pooled[0])
+        self.invalidate_cache()
+        logger.info(f"Created {collection} record: {doc_id}")
+    
     def update_media(self, doc_id, data, collection):
         """
         Update an existing media record in Firestore.
@@ -318,17 +970,30 @@ class FirestoreDB:
         Returns:
             bool: Success status
         """
-        if collection not in ['videos', 'audio', 'transcripts', 'other']:
+        if collection not in _VALID_COLLECTIONS:
             logger.error(f"Invalid collection: {collection}")
             return False
         
         try:
             # Update timestamps
-            data['updated_at'] = datetime.now()
+            data['updated_at'] = datetime.now(timezone.utc)
             
             # Update the document
-            doc_ref = self.client.collection(collection).document(doc_id)
-            doc_ref.update(data)
+            pooled = self._next_client()
+            doc_ref = self._collection(collection, pooled).document(doc_id)
+            
+            # Keep the search fields in sync when the searchable text changes,
+            # reading the stored values only when the update doesn't carry both
+            if 'session_name' in data or 'category' in data:
+                current = {}
+                if not _has_search_text(data):
+                    current = doc_ref.get(['session_name', 'category'], retry=_retry_policy()).to_dict() or {}
+                merged = add_search_fields({**current, **data})
+                for field in SEARCH_INDEX_FIELDS:
+                    data[field] = merged[field]
+            
+            self._record_filter_options([data], writes=[('update', doc_ref, data)], client=pooled[0])
+            self.invalidate_cache()
             logger.info(f"Updated {collection} record: {doc_id}")
             return True
         
@@ -347,14 +1012,15 @@ class FirestoreDB:
         Returns:
             bool: Success status
         """
-        if collection not in ['videos', 'audio', 'transcripts', 'other']:
+        if collection not in _VALID_COLLECTIONS:
             logger.error(f"Invalid collection: {collection}")
             return False
         
         try:
             # Delete the document
-            doc_ref = self.client.collection(collection).document(doc_id)
-            doc_ref.delete()
+            doc_ref = self._collection(collection).document(doc_id)
+            doc_ref.delete(retry=_retry_policy())
+            self.invalidate_cache()
             logger.info(f"Deleted {collection} record: {doc_id}")
             return True
         
@@ -362,59 +1028,519 @@ class FirestoreDB:
             logger.error(f"Error deleting {collection} record {doc_id}: {e}")
             return False
     
-    def get_unprocessed_media(self, media_type=None):
+    def _commit_in_batches(self, writes, batch_size=MAX_BATCH_SIZE, retry_individually=False, client=None):
+        """
+        Commit writes through WriteBatch objects instead of one RPC per document.
+        
+        Args:
+            writes (iterable): (operation, doc_ref, data) tuples, where operation
+                is 'set' or 'update'
+            batch_size (int): Number of writes committed per batch
+            retry_individually (bool): If a batch fails, retry its writes one at a
+                time so a single bad write doesn't sink the rest; writes that still
+                fail are logged and left out of the count. Otherwise the batch's
+                error is raised.
+            client (firestore.Client, optional): Client the write references were
+                built from; the batches are committed on it too
+            
+        Returns:
+            int: Number of writes committed
+        """
+        client = client or self.client
+        batch_size = min(batch_size, MAX_BATCH_SIZE)
+        committed = 0
+        pending = []
+        
+        for write in writes:
+            pending.append(write)
+            if len(pending) >= batch_size:
+                committed += self._commit_batch(pending, retry_individually, client)
+                pending = []
+        
+        if pending:
+            committed += self._commit_batch(pending, retry_individually, client)
+        
+        return committed
+    
+    def _commit_batch(self, writes, retry_individually=False, client=None):
+        """
+        Commit one WriteBatch, optionally falling back to per-document writes on failure.
+        
+        Args:
+            writes (list): (operation, doc_ref, data) tuples, at most MAX_BATCH_SIZE
+            retry_individually (bool): Retry the writes one at a time if the batch fails
+            client (firestore.Client, optional): Client the write references were built from
+            
+        Returns:
+            int: Number of writes committed
+        """
+        batch = (client or self.client).batch()
+        for operation, doc_ref, data in writes:
+            getattr(batch, operation)(doc_ref, data)
+        
+        try:
+            batch.commit(retry=_retry_policy())
+            return len(writes)
+        except Exception as e:
+            if not retry_individually:
+                raise
+            logger.warning(f"Batch of {len(writes)} writes failed, retrying individually: {e}")
+        
+        committed = 0
+        for operation, doc_ref, data in writes:
+            try:
+                getattr(doc_ref, operation)(data, retry=_retry_policy())
+                committed += 1
+            except Exception as e:
+                logger.error(f"Error writing {doc_ref.path}: {e}")
+        return committed
+    
+    def add_media_bulk(self, records):
+        """
+        Add many media records to Firestore using batched writes.
+        
+        Args:
+            records (list): (data, collection) tuples, as accepted by add_media
+            
+        Returns:
+            tuple: (bool, list) - Success status and the new document IDs, in input order
+        """
+        for _, collection in records:
+            if collection not in _VALID_COLLECTIONS:
+                logger.error(f"Invalid collection: {collection}")
+                return False, []
+        
+        writes = []
+        pooled = self._next_client()
+        now = datetime.now(timezone.utc)
+        for data, collection in records:
+            # Add timestamps and normalized search fields
+            data['created_at'] = now
+            data['updated_at'] = now
+            add_search_fields(data)
+            writes.append(('set', self._collection(collection, pooled).document(), data))
+        
+        try:
+            self._commit_in_batches(writes, client=pooled[0])
+            self._record_filter_options((data for _, _, data in writes), client=pooled[0])
+            self.invalidate_cache()
+            logger.info(f"Added {len(writes)} media records")
+            return True, [doc_ref.id for _, doc_ref, _ in writes]
+        
+        except Exception as e:
+            logger.error(f"Error adding media records in bulk: {e}")
+            return False, []
+    
+    def update_media_bulk(self, updates):
+        """
+        Update many existing media records in Firestore using batched writes.
+        
+        Args:
+            updates (list): (doc_id, data, collection) tuples, as accepted by update_media
+            
+        Returns:
+            bool: Success status
+        """
+        for _, _, collection in updates:
+            if collection not in _VALID_COLLECTIONS:
+                logger.error(f"Invalid collection: {collection}")
+                return False
+        
+        try:
+            pooled = self._next_client()
+            writes = [
+                ('update', self._collection(collection, pooled).document(doc_id), data)
+                for doc_id, data, collection in updates
+            ]
+            
+            # Keep the search fields in sync, reading the current values of any
+            # records whose searchable text partly changes in one batched RPC
+            search_refs = [doc_ref for _, doc_ref, data in writes
+                           if ('session_name' in data or 'category' in data) and not _has_search_text(data)]
+            current = {}
+            if search_refs:
+                for doc in pooled[0].get_all(search_refs, field_paths=['session_name', 'category'], retry=_retry_policy()):
+                    current[doc.reference.path] = doc.to_dict() or {}
+            
+            now = datetime.now(timezone.utc)
+            for _, doc_ref, data in writes:
+                data['updated_at'] = now
+                if 'session_name' in data or 'category' in data:
+                    merged = add_search_fields({**current.get(doc_ref.path, {}), **data})
+                    for field in SEARCH_INDEX_FIELDS:
+                        data[field] = merged[field]
+            
+            self._commit_in_batches(writes, client=pooled[0])
+            self._record_filter_options((data for _, _, data in writes), client=pooled[0])
+            self.invalidate_cache()
+            logger.info(f"Updated {len(writes)} media records")
+            return True
+        
+        except Exception as e:
+            logger.error(f"Error updating media records in bulk: {e}")
+            return False
+    
+    def backfill_search_fields(self, batch_size=MAX_BATCH_SIZE):
+        """
+        Add search fields to existing records that were written without them.
+        
+        Collections are backfilled concurrently, each paging through its own
+        documents and committing its own write batches.
+        
+        Args:
+            batch_size (int): Number of updates committed per write batch
+            
+        Returns:
+            int: Number of records updated
+        """
+        def writes(collection, pooled):
+            # Read in cursor-paginated pages so each read is retryable and only one
+            # page is held in memory while its updates are committed
+            collection_ref = self._collection(collection, pooled)
+            query = collection_ref.select(['session_name', 'category', 'search_tokens'])
+            for data in self._iter_collection(collection, query, min(batch_size, MAX_BATCH_SIZE)):
+                if 'search_tokens' in data:
+                    continue
+                fields = add_search_fields(data)
+                yield 'update', collection_ref.document(data['_id']), {field: fields[field] for field in SEARCH_INDEX_FIELDS}
+        
+        def backfill(collection):
+            # One client per collection, for both its reads and its write batches
+            pooled = self._next_client()
+            updated = self._commit_in_batches(
+                writes(collection, pooled), batch_size, retry_individually=True, client=pooled[0]
+            )
+            logger.info(f"Backfilled search fields on {updated} records in {collection}")
+            return updated
+        
+        return sum(_QUERY_EXECUTOR.map(backfill, MEDIA_COLLECTIONS))
+    
+    def get_unprocessed_media(self, media_type=None, limit=None, start_after=None, fields=None):
         """
         Get media records that haven't been processed yet.
         
+        Results are ordered by document ID so large backlogs can be paged through
+        with a cursor instead of re-reading every pending record on each call.
+        
         Args:
             media_type (str, optional): Filter by media type
+            limit (int, optional): Maximum number of records to return per collection
+            start_after (dict, optional): Map of collection name to the last document ID
+                already seen; results for that collection resume after it
+            fields (list, optional): Only fetch these fields instead of whole documents
             
         Returns:
             list: List of unprocessed media records
         """
-        results = []
-        collections = []
+        start_after = start_after or {}
         
         # Determine which collections to query
-        if media_type == 'video':
-            collections = ['videos']
-        elif media_type == 'audio':
-            collections = ['audio']
-        elif media_type == 'transcript':
-            collections = ['transcripts']
-        else:
-            collections = ['videos', 'audio', 'transcripts', 'other']
-        
-        # Query each collection
-        for collection in collections:
-            query = self.client.collection(collection).where(
-                filter=FieldFilter("processed", "==", False)
+        collections = _MEDIA_TYPE_COLLECTIONS.get(media_type, MEDIA_COLLECTIONS)
+        
+        def build_query(collection):
+            query = self._collection(collection).where(
+                filter=_field_filter("processed", "==", False)
+            ).order_by('__name__')
+            
+            if fields:
+                query = query.select(list(fields))
+            if start_after.get(collection):
+                query = query.start_after({'__name__': start_after[collection]})
+            if limit:
+                query = query.limit(limit)
+            return query
+        
+        # Query all collections concurrently
+        return self._fetch_collections(collections, build_query)
+    
+    def get_processed_not_uploaded_media(self, media_type=None, fields=None):
+        """
+        Get media records that have been processed but not uploaded yet.
+        
+        Args:
+            media_type (str, optional): Filter by media type
+            fields (list, optional): Only fetch these fields instead of whole documents
+            
+        Returns:
+            list: List of processed but not uploaded media records
+        """
+        collections = _MEDIA_TYPE_COLLECTIONS.get(media_type, MEDIA_COLLECTIONS)
+        
+        def build_query(collection):
+            query = self._collection(collection).where(
+                filter=_field_filter("processed", "==", True)
+            ).where(
+                filter=_field_filter("uploaded", "==", False)
             )
+            if fields:
+                query = query.select(list(fields))
+            return query
+        
+        # Query all collections concurrently
+        return self._fetch_collections(collections, build_query)
+    
+    def iter_unprocessed_media(self, media_type=None, fields=None, chunk_size=MAX_BATCH_SIZE):
+        """
+        Iterate over media records that haven't been processed yet, one page at a time.
+        
+        Args:
+            media_type (str, optional): Filter by media type
+            fields (list, optional): Only fetch these fields instead of whole documents
+            chunk_size (int): Number of documents fetched per page
             
-            # Execute query and add results
-            docs = list(query.stream())
-            for doc in docs:
-                data = doc.to_dict()
-                data['_collection'] = collection
-                data['_id'] = doc.id
-                results.append(data)
+        Yields:
+            dict: Unprocessed media record
+        """
+        for collection in _MEDIA_TYPE_COLLECTIONS.get(media_type, MEDIA_COLLECTIONS):
+            query = self._collection(collection).where(
+                filter=_field_filter("processed", "==", False)
+            )
+            if fields:
+                query = query.select(list(fields))
+            yield from self._iter_collection(collection, query, chunk_size)
+
+
+class AsyncFirestoreDB:
+    """
+    Asyncio variant of FirestoreDB for the read-heavy query methods.
+    
+    Uses firestore.AsyncClient so per-collection queries run as coroutines on a
+    single event loop instead of occupying a thread each. The client is bound to
+    the event loop it's first used on, so create one instance per loop (the
+    simplified API creates one per worker process on its first request).
+    """
+    
+    def __init__(self, project_id=None):
+        """
+        Initialize the async Firestore client.
         
+        Args:
+            project_id (str, optional): Firebase project ID. If None, tries to get from environment.
+        """
+        self.project_id = project_id or get_firebase_project_id()
+        # (expiry, value) of the last get_statistics result
+        self._statistics = None
+        try:
+            self.client = _firestore().AsyncClient(project=self.project_id)
+            logger.info(f"Initialized async Firestore client for project: {self.project_id}")
+        except Exception as e:
+            logger.error(f"Failed to initialize async Firestore client: {e}")
+            raise
+    
+    async def _fetch_collection(self, collection, query):
+        """
+        Execute a query and tag each result with its collection name and document ID.
+        
+        Args:
+            collection (str): Collection name the query targets
+            query: Firestore async query to execute
+            
+        Returns:
+            list: List of document data
+        """
+        return [doc_to_data(doc, collection) async for doc in query.stream(retry=_async_retry_policy())]
+    
+    async def _fetch_collections(self, collections, build_query):
+        """
+        Query several collections concurrently with asyncio.gather.
+        
+        Args:
+            collections (list): Collection names to query
+            build_query (callable): Function mapping a collection name to its query
+            
+        Returns:
+            list: Document data from all collections, in collection order
+        """
+        batches = await asyncio.gather(*(
+            self._fetch_collection(collection, build_query(collection))
+            for collection in collections
+        ))
+        results = []
+        for batch in batches:
+            results.extend(batch)
         return results
+    
+    async def get_all_media(self, media_type=None, limit=None, fields=None, year=None, category=None):
+        """
+        Get all media records from Firestore.
+        
+        Args:
+            media_type (str, optional): Filter by media type ('video', 'audio', 'transcript')
+            limit (int, optional): Maximum number of records to return per collection
+            fields (list, optional): Only fetch these fields instead of whole documents
+            year (str, optional): Filter by year
+            category (str, optional): Filter by category
+            
+        Returns:
+            list: List of document data
+        """
+        collections = _MEDIA_TYPE_COLLECTIONS.get(media_type, MEDIA_COLLECTIONS)
+        
+        def build_query(collection):
+            query = self.client.collection(collection)
+            if year:
+                query = query.where(filter=_field_filter("year", "==", year))
+            if category:
+                query = query.where(filter=_field_filter("category", "==", category))
+            if fields:
+                query = query.select(list(fields))
+            if limit:
+                query = query.limit(limit)
+            return query
+        
+        return await self._fetch_collections(collections, build_query)
+    
+    async def get_media_by_id(self, media_id, collection=None, fields=None):
+        """
+        Get a specific media record by ID.
+        
+        Args:
+            media_id (str): Document ID
+            collection (str, optional): Collection name. If None, searches all collections.
+            fields (list, optional): Only fetch these fields instead of the whole document
+            
+        Returns:
+            dict: Document data or None if not found
+        """
+        collections = (collection,) if collection else MEDIA_COLLECTIONS
+        
+        # Fetch the candidate documents from every collection in a single batched RPC
+        refs = [self.client.collection(coll).document(media_id) for coll in collections]
+        found = {}
+        async for doc in self.client.get_all(
+            refs,
+            field_paths=list(fields) if fields else None,
+            retry=_async_retry_policy()
+        ):
+            if doc.exists:
+                found[doc.reference.parent.id] = doc
+        
+        # Return the first match in collection order
+        for coll in collections:
+            doc = found.get(coll)
+            if doc:
+                return doc_to_data(doc, coll)
+        
+        return None
+    
+    async def get_unprocessed_media(self, media_type=None, limit=None, start_after=None, fields=None):
+        """
+        Get media records that haven't been processed yet.
+        
+        Args:
+            media_type (str, optional): Filter by media type
+            limit (int, optional): Maximum number of records to return per collection
+            start_after (dict, optional): Map of collection name to the last document ID
+                already seen; results for that collection resume after it
+            fields (list, optional): Only fetch these fields instead of whole documents
+            
+        Returns:
+            list: List of unprocessed media records
+        """
+        start_after = start_after or {}
+        collections = _MEDIA_TYPE_COLLECTIONS.get(media_type, MEDIA_COLLECTIONS)
+        
+        def build_query(collection):
+            query = self.client.collection(collection).where(
+                filter=_field_filter("processed", "==", False)
+            ).order_by('__name__')
+            if fields:
+                query = query.select(list(fields))
+            if start_after.get(collection):
+                query = query.start_after({'__name__': start_after[collection]})
+            if limit:
+                query = query.limit(limit)
+            return query
+        
+        return await self._fetch_collections(collections, build_query)
+    
+    async def get_processed_not_uploaded_media(self, media_type=None, fields=None):
+        """
+        Get media records that have been processed but not uploaded yet.
+        
+        Args:
+            media_type (str, optional): Filter by media type
+            fields (list, optional): Only fetch these fields instead of whole documents
+            
+        Returns:
+            list: List of processed but not uploaded media records
+        """
+        collections = _MEDIA_TYPE_COLLECTIONS.get(media_type, MEDIA_COLLECTIONS)
+        
+        def build_query(collection):
+            query = self.client.collection(collection).where(
+                filter=_field_filter("processed", "==", True)
+            ).where(
+                filter=_field_filter("uploaded", "==", False)
+            )
+            if fields:
+                query = query.select(list(fields))
+            return query
+        
+        return await self._fetch_collections(collections, build_query)
+    
+    
+    async def _count_collection(self, collection):
+        """
+        Count the documents in a collection with a server-side COUNT aggregation.
+        
+        Args:
+            collection (str): Collection name
+            
+        Returns:
+            int: Number of documents in the collection
+        """
+        result = await self.client.collection(collection).count().get(retry=_async_retry_policy())
+        return result[0][0].value
+    
+    async def get_statistics(self, refresh=False):
+        """
+        Get statistics about the available media.
+        
+        Args:
+            refresh (bool): Recount instead of returning counts cached within
+                the last STATISTICS_CACHE_TTL seconds
+        
+        Returns:
+            dict: Dictionary with media counts
+        """
+        if not refresh and self._statistics and self._statistics[0] > time.monotonic():
+            return self._statistics[1]
+        
+        video_count, audio_count, transcript_count, other_count = await asyncio.gather(
+            *(self._count_collection(collection) for collection in MEDIA_COLLECTIONS)
+        )
+        
+        statistics = {
+            'total': video_count + audio_count + transcript_count + other_count,
+            'videos': video_count,
+            'audio': audio_count,
+            'transcripts': transcript_count,
+            'other': other_count
+        }
+        self._statistics = (time.monotonic() + STATISTICS_CACHE_TTL, statistics)
+        return statistics
 
 
 # Create a singleton instance
 _firestore_db_instance = None
+_firestore_db_lock = threading.Lock()
 
 def get_firestore_db():
     """
     Get the Firestore DB instance (singleton pattern).
     
+    Safe to call from several threads at once: only the first caller builds
+    the instance, the rest wait for it instead of building their own.
+    
     Returns:
         FirestoreDB: Firestore database client instance
     """
     global _firestore_db_instance
     if _firestore_db_instance is None:
-        _firestore_db_instance = FirestoreDB()
+        with _firestore_db_lock:
+            if _firestore_db_instance is None:
+                _firestore_db_instance = FirestoreDB()
     return _firestore_db_instance
 
 
@@ -12,30 +12,33 @@ across the application, providing consistent access patterns and security.
 """
 
 import os
+import re
 import sys
 import logging
+import functools
 import getpass
 import keyring
 import json
 from pathlib import Path
 
+# Base directory for the project
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 # Configure logging
-logs_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'logs')
+logs_dir = os.path.join(BASE_DIR, 'data', 'logs')
 os.makedirs(logs_dir, exist_ok=True)
 
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     handlers=[
-        logging.FileHandler(os.path.join(logs_dir, 'secrets_manager.log')),
+        # delay=True: the log file is only opened once something is logged
+        logging.FileHandler(os.path.join(logs_dir, 'secrets_manager.log'), delay=True),
         logging.StreamHandler()
     ]
 )
 logger = logging.getLogger('secrets_manager')
 
-# Base directory for the project
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-
 # Constants for keychain services
 KEYCHAIN_SERVICES = {
     'gemini_api': "IdahoLegislatureDownloader",
@@ -47,12 +50,38 @@ KEYCHAIN_SERVICES = {
 # Environment variable prefixes
 ENV_PREFIX = "IDAHO_LEG_"
 
+# Secret names whose values are hidden when prompted for
+_SENSITIVE_RE = re.compile(r"password|key|token", re.IGNORECASE)
+
 # Service account paths
 SERVICE_ACCOUNT_PATHS = {
     'drive': os.path.join(BASE_DIR, 'data', 'service_account.json'),
     'gcs': os.path.join(BASE_DIR, 'data', 'gcs_service_account.json'),
 }
 
+# Every secret the application reads, by secret type
+KNOWN_SECRETS = {
+    'gemini_api': ('GeminiAPI',),
+    'github': ('username', 'repo_name', 'token', 'description', 'visibility'),
+    'cloud_storage': ('GCS_BUCKET_NAME', 'USE_CLOUD_STORAGE', 'CLOUD_STORAGE_PUBLIC', 'PREFER_CLOUD_STORAGE'),
+    'service_accounts': ('drive_path', 'gcs_path', 'drive_content', 'gcs_content')
+}
+
+# Secrets already resolved in this process, keyed by (secret_type, username),
+# so repeated reads don't each make a round trip to the keychain
+_SECRET_CACHE = {}
+
+# Cached in place of a secret the keychain doesn't have
+_MISSING = object()
+
+# Parsed service account JSON, keyed by service type
+_SERVICE_ACCOUNT_CACHE = {}
+
+@functools.lru_cache(maxsize=None)
+def _keyring_backend():
+    """Resolve the keyring backend once and reuse it for every keychain call."""
+    return keyring.get_keyring()
+
 class SecretsManager:
     """
     Centralized manager for all application secrets and credentials.
@@ -81,11 +110,12 @@ class SecretsManager:
             return False
         
         try:
-            keyring.set_password(service, username, value)
+            _keyring_backend().set_password(service, username, value)
+            _SECRET_CACHE[(secret_type, username)] = value
             if sensitive:
-                logger.info(f"Stored secret {username} in {secret_type} keychain")
+                logger.info("Stored secret %s in %s keychain", username, secret_type)
             else:
-                logger.info(f"Stored {username}={value} in {secret_type} keychain")
+                logger.info("Stored %s=%s in %s keychain", username, value, secret_type)
             return True
         except Exception as e:
             logger.error(f"Error storing secret {username} in {secret_type} keychain: {e}")
@@ -106,32 +136,42 @@ class SecretsManager:
         Returns:
             str: The secret value or None if not found and no prompt provided
         """
+        # Reuse a value already resolved in this process; only known secret
+        # types are ever cached, so the service lookup can wait until a miss
+        cached = _SECRET_CACHE.get((secret_type, username))
+        if cached and cached is not _MISSING:
+            return cached
+        
         service = KEYCHAIN_SERVICES.get(secret_type)
         if not service:
             logger.error(f"Unknown secret type: {secret_type}")
             return None
         
-        # Try keychain first
-        try:
-            value = keyring.get_password(service, username)
-            if value:
-                logger.debug(f"Retrieved secret {username} from {secret_type} keychain")
-                return value
-        except Exception as e:
-            logger.warning(f"Error retrieving secret {username} from {secret_type} keychain: {e}")
+        # Try keychain first, unless it's already known not to have the secret
+        if cached is not _MISSING:
+            try:
+                value = _keyring_backend().get_password(service, username)
+                if value:
+                    logger.debug("Retrieved secret %s from %s keychain", username, secret_type)
+                    _SECRET_CACHE[(secret_type, username)] = value
+                    return value
+                _SECRET_CACHE[(secret_type, username)] = _MISSING
+            except Exception as e:
+                logger.warning(f"Error retrieving secret {username} from {secret_type} keychain: {e}")
         
         # Try environment variable if provided
         if env_var:
             full_env_var = f"{ENV_PREFIX}{env_var}"
             value = os.environ.get(full_env_var)
             if value:
-                logger.debug(f"Retrieved secret {username} from environment variable {full_env_var}")
+                logger.debug("Retrieved secret %s from environment variable %s", username, full_env_var)
+                _SECRET_CACHE[(secret_type, username)] = value
                 return value
         
         # If automatic options failed and prompt is provided, ask interactively
         if prompt:
             logger.info(f"Secret {username} not found in keychain or environment, prompting user")
-            if "password" in username.lower() or "key" in username.lower() or "token" in username.lower():
+            if _SENSITIVE_RE.search(username):
                 # Hide input for sensitive fields
                 value = getpass.getpass(prompt)
             else:
@@ -162,8 +202,10 @@ class SecretsManager:
             logger.error(f"Unknown secret type: {secret_type}")
             return False
         
+        _SECRET_CACHE.pop((secret_type, username), None)
+        
         try:
-            keyring.delete_password(service, username)
+            _keyring_backend().delete_password(service, username)
             logger.info(f"Deleted secret {username} from {secret_type} keychain")
             return True
         except keyring.errors.PasswordDeleteError:
@@ -173,6 +215,94 @@ class SecretsManager:
             logger.error(f"Error deleting secret {username} from {secret_type} keychain: {e}")
             return False
     
+    @staticmethod
+    def clear_cache():
+        """Forget secrets cached in this process, so the next reads go to the keychain."""
+        _SECRET_CACHE.clear()
+        _SERVICE_ACCOUNT_CACHE.clear()
+    
+    @staticmethod
+    def prefetch_all():
+        """
+        Read every known secret from the keychain into the process cache.
+        
+        Meant to run once at startup, so later reads (including those of worker
+        processes forked afterwards) are served from memory. Secrets missing from
+        the keychain are remembered as missing; environment variables and prompts
+        are still consulted when they're read.
+        
+        Returns:
+            int: Number of secrets found in the keychain
+        """
+        found = 0
+        for secret_type, usernames in KNOWN_SECRETS.items():
+            bundle = SecretsManager.get_bundle(secret_type, usernames)
+            found += sum(1 for value in bundle.values() if value)
+        
+        logger.info(f"Prefetched {found} secrets from the keychain")
+        return found
+    
+    @staticmethod
+    def get_bundle(secret_type, usernames):
+        """
+        Read several secrets of one type from the keychain in a single pass.
+        
+        Secrets not cached yet are read through one keyring backend handle and
+        cached, including those the keychain doesn't have. Environment variables
+        and prompts are not consulted.
+        
+        Args:
+            secret_type: Category of secret (e.g., 'github', 'cloud_storage')
+            usernames: Identifiers of the secrets within the category
+            
+        Returns:
+            dict: Secret value (or None if not in the keychain) by username
+        """
+        service = KEYCHAIN_SERVICES.get(secret_type)
+        if not service:
+            logger.error(f"Unknown secret type: {secret_type}")
+            return {}
+        
+        backend = _keyring_backend()
+        bundle = {}
+        for username in usernames:
+            value = _SECRET_CACHE.get((secret_type, username))
+            if value is None:
+                try:
+                    value = backend.get_password(service, username)
+                except Exception as e:
+                    logger.warning(f"Error retrieving secret {username} from {secret_type} keychain: {e}")
+                    bundle[username] = None
+                    continue
+                _SECRET_CACHE[(secret_type, username)] = value or _MISSING
+            bundle[username] = None if value is _MISSING else value or None
+        
+        return bundle
+    
+    @staticmethod
+    def export_cache():
+        """
+        Snapshot the secrets cached in this process, to hand to a child process.
+        
+        Returns:
+            dict: Cached values keyed by (secret_type, username); None marks a
+                secret the keychain doesn't have
+        """
+        return {key: None if value is _MISSING else value for key, value in _SECRET_CACHE.items()}
+    
+    @staticmethod
+    def install_cache(entries):
+        """
+        Seed this process's cache with a snapshot from export_cache.
+        
+        Entries already cached in this process are kept.
+        
+        Args:
+            entries (dict): Snapshot returned by export_cache
+        """
+        for key, value in entries.items():
+            _SECRET_CACHE.setdefault(key, _MISSING if value is None else value)
+    
     @staticmethod
     def get_gemini_api_key():
         """
@@ -196,6 +326,9 @@ class SecretsManager:
         Returns:
             dict: GitHub credentials (username, repo_name, token)
         """
+        # Read all the GitHub secrets from the keychain in one pass
+        SecretsManager.get_bundle('github', KNOWN_SECRETS['github'])
+        
         # Get username
         username = SecretsManager.get_secret(
             'github',
@@ -254,6 +387,9 @@ class SecretsManager:
         Returns:
             dict: GCS settings
         """
+        # Read all the cloud storage settings from the keychain in one pass
+        SecretsManager.get_bundle('cloud_storage', KNOWN_SECRETS['cloud_storage'])
+        
         # Get bucket name
         bucket_name = SecretsManager.get_secret(
             'cloud_storage',
@@ -348,7 +484,8 @@ class SecretsManager:
         """
         if isinstance(json_content, dict):
             json_content = json.dumps(json_content)
-            
+        
+        _SERVICE_ACCOUNT_CACHE.pop(service_type, None)
         return SecretsManager.store_secret(
             'service_accounts',
             f"{service_type}_content",
@@ -366,6 +503,10 @@ class SecretsManager:
         Returns:
             dict: Service account JSON content or None if not found
         """
+        # Reuse the content already parsed in this process
+        if service_type in _SERVICE_ACCOUNT_CACHE:
+            return _SERVICE_ACCOUNT_CACHE[service_type]
+        
         json_content = SecretsManager.get_secret(
             'service_accounts',
             f"{service_type}_content",
@@ -377,19 +518,31 @@ class SecretsManager:
             path = SecretsManager.get_service_account_path(service_type)
             if path and os.path.exists(path):
                 try:
-                    with open(path, 'r') as f:
-                        json_content = f.read()
+                    # Parse straight from the file rather than reading it into a string first
+                    with open(path, 'rb') as f:
+                        content = json.load(f)
                     
                     # Store the content for future use
-                    SecretsManager.store_service_account_content(service_type, json_content)
+                    SecretsManager.store_service_account_content(
+                        service_type, json.dumps(content, separators=(',', ':'))
+                    )
+                except json.JSONDecodeError:
+                    logger.error(f"Invalid JSON content for {service_type} service account")
+                    return None
                 except Exception as e:
                     logger.error(f"Error reading service account file {path}: {e}")
                     return None
+                
+                # Already parsed, so there's no need to parse the stored copy again
+                _SERVICE_ACCOUNT_CACHE[service_type] = content
+                return content
             else:
                 return None
         
         try:
-            return json.loads(json_content)
+            content = json.loads(json_content)
+            _SERVICE_ACCOUNT_CACHE[service_type] = content
+            return content
         except json.JSONDecodeError:
             logger.error(f"Invalid JSON content for {service_type} service account")
             return None
@@ -4,12 +4,12 @@ Provides a single entry point for running the backend services.
 
 This module serves as the main entry point for running the Idaho Legislature Media
 backend services. It can launch both the API server and file server concurrently
-using Python's multiprocessing, or run just one of them based on command-line arguments.
+in a single process and event loop, or run just one of them based on command-line arguments.
 
 Features:
 - Environment variable configuration via dotenv
 - Command-line argument support for flexible deployment
-- Concurrent execution of both services
+- Concurrent execution of both services in one process
 - Proper process management and error handling
 - Configurable ports for each service
 
@@ -18,68 +18,173 @@ Usage examples:
 - Run only API:         python server.py --api-only
 - Run only file server: python server.py --file-only
 - Custom ports:         python server.py --api-port 8000 --file-port 8001
+- Several workers:      python server.py --api-only --workers 4
 """
 
 import os
+import sys
+import queue
+import atexit
 import logging
 import argparse
+import asyncio
+import importlib
 import multiprocessing
 import uvicorn
+from logging.handlers import QueueHandler, QueueListener
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Base directory for the project
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 # Configure logging
 # Create logs directory if it doesn't exist
-logs_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'logs')
+logs_dir = os.path.join(BASE_DIR, 'data', 'logs')
 os.makedirs(logs_dir, exist_ok=True)
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(os.path.join(logs_dir, 'server.log')),
+# Only when the calling script hasn't configured logging already
+if not logging.getLogger().handlers:
+    # Records are queued and written out by a background thread, so logging calls
+    # don't wait on file or console I/O
+    log_queue = queue.SimpleQueue()
+    log_listener = QueueListener(
+        log_queue,
+        # delay=True: the log file is only opened once something is logged
+        logging.FileHandler(os.path.join(logs_dir, 'server.log'), delay=True),
         logging.StreamHandler()
-    ]
-)
+    )
+    log_listener.start()
+    atexit.register(log_listener.stop)
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[QueueHandler(log_queue)]
+    )
 
 logger = logging.getLogger('server')
 
-def run_api(port):
-    """Run the API server."""
-    logger.info(f"Starting API server on port {port}")
-    # Use Firestore backend instead of SQLite
-    # First try to rename transcript_db.py to transcript_db_sqlite.py if not already done
-    if not os.path.exists(os.path.join(os.path.dirname(__file__), 'transcript_db_sqlite.py')):
-        try:
-            src_path = os.path.join(os.path.dirname(__file__), 'transcript_db.py')
-            dst_path = os.path.join(os.path.dirname(__file__), 'transcript_db_sqlite.py')
-            if os.path.exists(src_path):
-                import shutil
-                shutil.copy2(src_path, dst_path)
-                logger.info(f"Backed up SQLite implementation to transcript_db_sqlite.py")
-        except Exception as e:
-            logger.warning(f"Could not backup transcript_db.py: {e}")
-    
-    # Now use the Firestore version as transcript_db.py
+def install_secrets(secrets):
+    """Seed this process's secrets cache with the parent's prefetched secrets."""
+    if secrets:
+        from src.secrets_manager import SecretsManager
+        SecretsManager.install_cache(secrets)
+
+def use_firestore_transcript_db():
+    """Use the Firestore backend instead of SQLite for transcript_db in this process."""
+    # Alias the module rather than copying the Firestore implementation over transcript_db.py
     try:
-        src_path = os.path.join(os.path.dirname(__file__), 'transcript_db_firestore.py')
-        dst_path = os.path.join(os.path.dirname(__file__), 'transcript_db.py')
-        if os.path.exists(src_path):
-            import shutil
-            shutil.copy2(src_path, dst_path)
-            logger.info(f"Using Firestore implementation for transcript_db.py")
+        firestore_transcript_db = importlib.import_module('src.transcript_db_firestore')
+        sys.modules['src.transcript_db'] = firestore_transcript_db
+        sys.modules['transcript_db'] = firestore_transcript_db
+        logger.info(f"Using Firestore implementation for transcript_db")
     except Exception as e:
         logger.warning(f"Could not use Firestore transcript_db: {e}")
+
+def create_api_app():
+    """
+    Build the API app for the process uvicorn runs it in.
+    
+    uvicorn calls this factory in each reload or worker process, so the
+    Firestore transcript_db alias is set up there, not just in the parent.
+    """
+    use_firestore_transcript_db()
+    from src.api_firestore import app
+    return app
+
+def create_file_app():
+    """Build the file server app for the process uvicorn runs it in."""
+    from src.file_server import app
+    return app
+
+def run_api(port, secrets=None, reload=False, workers=1):
+    """
+    Run the API server.
+    
+    The prefetched secrets only seed this process's cache. Reload and worker
+    processes (workers > 1) start fresh, so each reads the secrets it uses from
+    the keychain once; secret values are deliberately not handed to them through
+    the environment, where every subprocess would inherit them.
+    """
+    install_secrets(secrets)
+    logger.info(f"Starting API server on port {port}")
     
     # Run the API server
-    uvicorn.run("src.api_firestore:app", host="0.0.0.0", port=port, reload=True)
+    uvicorn.run("src.server:create_api_app", factory=True, host="0.0.0.0", port=port,
+                reload=reload, workers=workers)
 
-def run_file_server(port):
-    """Run the file server."""
+def run_file_server(port, secrets=None, reload=False, workers=1):
+    """
+    Run the file server.
+    
+    As with run_api, reload and worker processes read their secrets from the
+    keychain themselves.
+    """
+    install_secrets(secrets)
     logger.info(f"Starting file server on port {port}")
-    uvicorn.run("src.file_server:app", host="0.0.0.0", port=port, reload=True)
+    uvicorn.run("src.server:create_file_app", factory=True, host="0.0.0.0", port=port,
+                reload=reload, workers=workers)
+
+async def serve_both(api_port, file_port):
+    """
+    Serve the API and the file server from one event loop.
+    
+    Both apps share this interpreter, so modules are imported once and the
+    secrets cache, Firestore clients and keyring backend are shared too.
+    
+    Needs uvicorn 0.29 or later: earlier releases install one process-wide
+    signal handler per server, so the second server's handler replaced the
+    first's and Ctrl-C stopped only one of them. From 0.29 each server captures
+    the signal and passes it on to the handler it replaced, so both shut down.
+    
+    Args:
+        api_port (int): Port for the API server
+        file_port (int): Port for the file server
+    """
+    api_app = create_api_app()
+    file_app = create_file_app()
+    
+    api_server = uvicorn.Server(uvicorn.Config(api_app, host="0.0.0.0", port=api_port))
+    file_server = uvicorn.Server(uvicorn.Config(file_app, host="0.0.0.0", port=file_port))
+    await asyncio.gather(api_server.serve(), file_server.serve())
+
+def run_both_processes(api_port, file_port, secrets=None, reload=False):
+    """Run each server in its own process, which auto-reload requires."""
+    api_process = multiprocessing.Process(target=run_api, args=(api_port, secrets, reload))
+    file_process = multiprocessing.Process(target=run_file_server, args=(file_port, secrets, reload))
+    
+    # Start both processes
+    api_process.start()
+    file_process.start()
+    
+    # Wait for both processes to complete
+    # This blocks the main thread until both servers are terminated
+    # which allows for proper cleanup on exit
+    api_process.join()
+    file_process.join()
+
+def prefetch_secrets():
+    """
+    Load the keychain secrets once in the parent process.
+    
+    The snapshot is passed to the server processes, so they start with a
+    populated cache instead of each reading every secret from the keychain
+    again. Passing it explicitly also works where processes are spawned rather
+    than forked (the default on macOS).
+    
+    Returns:
+        dict: Snapshot of the secrets cache, empty if prefetching failed
+    """
+    try:
+        from src.secrets_manager import SecretsManager
+        SecretsManager.prefetch_all()
+        return SecretsManager.export_cache()
+    except Exception as e:
+        logger.warning(f"Could not prefetch secrets: {e}")
+        return {}
 
 def main():
     """
@@ -96,6 +201,8 @@ def main():
     - --file-port: Specify custom port for the file server
     - --api-only: Run only the API server
     - --file-only: Run only the file server
+    - --reload: Restart the servers when source files change (development only)
+    - --workers: Worker processes for a single server (--api-only or --file-only)
     """
     parser = argparse.ArgumentParser(description="Run the Idaho Legislature Media backend services")
     parser.add_argument("--api-port", type=int, default=int(os.getenv("API_PORT", 5000)),
@@ -104,32 +211,33 @@ def main():
                         help="Port for the file server (default: 5001)")
     parser.add_argument("--api-only", action="store_true", help="Run only the API server")
     parser.add_argument("--file-only", action="store_true", help="Run only the file server")
+    parser.add_argument("--reload", action="store_true",
+                        default=os.getenv("IDAHO_LEG_ENV") == "dev",
+                        help="Restart on source changes (default: only when IDAHO_LEG_ENV=dev)")
+    # On a bare VM, use about one worker per CPU; where the platform scales out
+    # containers itself (Cloud Run, Kubernetes), one worker per container is enough
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", 1)),
+                        help="Worker processes with --api-only or --file-only (default: WEB_CONCURRENCY or 1); "
+                             "each worker reads secrets from the keychain itself")
     
     args = parser.parse_args()
     
+    secrets = prefetch_secrets()
+    
     try:
         if args.api_only:
-            run_api(args.api_port)
+            run_api(args.api_port, secrets, args.reload, args.workers)
         elif args.file_only:
-            run_file_server(args.file_port)
+            run_file_server(args.file_port, secrets, args.reload, args.workers)
         else:
-            # Run both servers concurrently using Python's multiprocessing
-            # This allows each server to run in its own process with separate resources
             logger.info(f"Starting both API server (port {args.api_port}) and file server (port {args.file_port})...")
             
-            # Create process objects for each server
-            api_process = multiprocessing.Process(target=run_api, args=(args.api_port,))
-            file_process = multiprocessing.Process(target=run_file_server, args=(args.file_port,))
-            
-            # Start both processes
-            api_process.start()
-            file_process.start()
-            
-            # Wait for both processes to complete
-            # This blocks the main thread until both servers are terminated
-            # which allows for proper cleanup on exit
-            api_process.join()
-            file_process.join()
+            if args.reload:
+                # uvicorn's reloader supervises a single app, so give each its own process
+                run_both_processes(args.api_port, args.file_port, secrets, args.reload)
+            else:
+                # Both apps are asyncio/uvicorn apps, so one event loop can serve them
+                asyncio.run(serve_both(args.api_port, args.file_port))
     
     except KeyboardInterrupt:
         logger.info("Server stopping due to keyboard interrupt")
@@ -5,11 +5,13 @@ Provides access to videos, audio, and transcripts in Firestore.
 """
 
 import os
+import time
+import asyncio
 import logging
 from datetime import datetime
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
-from google.cloud import firestore
+from firestore_db import AsyncFirestoreDB
 
 # Configure logging
 logging.basicConfig(
@@ -39,41 +41,141 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Fields read by the list endpoints; everything else is left on the server
+MEDIA_LIST_FIELDS = ['category', 'session_name', 'year', 'last_modified', 'created_at', 'gcs_path']
+
 # Initialize Firestore client
 def get_firestore_client():
     project_id = os.environ.get('GOOGLE_CLOUD_PROJECT', 'legislativevideoreviewswithai')
     logger.info(f"Initializing Firestore client for project: {project_id}")
     
     try:
-        return firestore.Client(project=project_id)
+        # Async client, so queries don't block the event loop serving other requests
+        return AsyncFirestoreDB(project_id=project_id)
     except Exception as e:
         logger.error(f"Failed to initialize Firestore client: {e}")
         raise
 
-# Create a global client
-try:
-    db = get_firestore_client()
-    logger.info("Firestore client initialized successfully")
-except Exception as e:
-    logger.error(f"Failed to initialize Firestore: {e}")
-    db = None
+# Client for this process, created on first use rather than at import. With
+# several workers the module is also imported by the uvicorn supervisor, which
+# never serves a request, so it shouldn't open a Firestore connection
+_db = None
+_db_initialized = False
+
+def get_db():
+    """
+    Get this process's Firestore client, creating it on first use.
+    
+    Returns:
+        AsyncFirestoreDB: The client, or None if it couldn't be created
+    """
+    global _db, _db_initialized
+    if not _db_initialized:
+        _db_initialized = True
+        try:
+            _db = get_firestore_client()
+            logger.info("Firestore client initialized successfully")
+        except Exception as e:
+            logger.error(f"Failed to initialize Firestore: {e}")
+    return _db
+
+# Response parts that can't change while the process runs, built once at import
+ENVIRONMENT_INFO = {
+    "port": os.environ.get("PORT", "Not set"),
+    "project": os.environ.get("GOOGLE_CLOUD_PROJECT", "Not set"),
+    "bucket": os.environ.get("GCS_BUCKET_NAME", "Not set")
+}
+MOCK_VIDEOS = [
+    {"id": "mock1", "title": "Mock Video (Firestore not connected)", "description": "This is a mock video", "year": "2025", "category": "House Chambers"}
+]
+MOCK_AUDIO = [
+    {"id": "mock1", "title": "Mock Audio (Firestore not connected)", "description": "This is a mock audio file", "year": "2025", "category": "House Chambers"}
+]
+MOCK_TRANSCRIPTS = [
+    {"id": "mock1", "title": "Mock Transcript (Firestore not connected)", "description": "This is a mock transcript", "year": "2025", "category": "House Chambers"}
+]
+EMPTY_STATS = {"total": 0, "videos": 0, "audio": 0, "transcripts": 0}
+
+# Seconds a response is served from memory before Firestore is queried again.
+# The cache is per process and browsers/CDNs may hold copies too, so newly
+# ingested media simply shows up once these expire
+LIST_CACHE_TTL = 30
+STATS_CACHE_TTL = 60
+LIST_CACHE_CONTROL = f"public, max-age={LIST_CACHE_TTL}"
+STATS_CACHE_CONTROL = f"public, max-age={STATS_CACHE_TTL}"
+
+# Cache key -> (expiry, response) for recent responses
+_response_cache = {}
+# Cache key -> lock, so a burst of requests for an expired entry runs one query
+_response_locks = {}
+
+async def get_cached(key, ttl, load):
+    """
+    Return a cached response, loading it if it's missing or expired.
+    
+    Args:
+        key: Cache key for the response
+        ttl: Seconds to keep a freshly loaded response
+        load: Coroutine function that loads the response
+        
+    Returns:
+        The cached or freshly loaded response
+    """
+    entry = _response_cache.get(key)
+    if entry and entry[0] > time.monotonic():
+        return entry[1]
+    
+    lock = _response_locks.setdefault(key, asyncio.Lock())
+    async with lock:
+        # Another request may have loaded it while this one waited
+        entry = _response_cache.get(key)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+        
+        value = await load()
+        _response_cache[key] = (time.monotonic() + ttl, value)
+        return value
+
+async def list_media(media_type):
+    """
+    Get the first few records of a media type, formatted for the list endpoints.
+    
+    Args:
+        media_type: Media type ('video', 'audio' or 'transcript')
+        
+    Returns:
+        list: Media items
+    """
+    records = await get_db().get_all_media(media_type=media_type, limit=10, fields=MEDIA_LIST_FIELDS)
+    items = []
+    
+    for data in records:
+        items.append({
+            "id": data['_id'],
+            "title": f"{data.get('category', 'Unknown')} - {data.get('session_name', 'Unknown')}",
+            "description": f"Legislative Session {data.get('year', 'Unknown')}",
+            "year": data.get('year', 'Unknown'),
+            "category": data.get('category', 'Unknown'),
+            "date": data.get('last_modified') or data.get('created_at'),
+            "url": data.get('gcs_path', '')
+        })
+    
+    return items
 
 @app.get("/")
-def root():
+async def root():
     """Root endpoint to test basic functionality."""
     return {
         "message": "Idaho Legislature Media API - Simplified Firestore Version",
         "timestamp": datetime.now().isoformat(),
         "environment": {
-            "port": os.environ.get("PORT", "Not set"),
-            "project": os.environ.get("GOOGLE_CLOUD_PROJECT", "Not set"),
-            "bucket": os.environ.get("GCS_BUCKET_NAME", "Not set"),
-            "firestore": "Connected" if db is not None else "Not connected"
+            **ENVIRONMENT_INFO,
+            "firestore": "Connected" if get_db() is not None else "Not connected"
         }
     }
 
 @app.get("/api/health")
-def health_check():
+async def health_check():
     """API health check endpoint."""
     return {
         "status": "healthy", 
@@ -82,113 +184,67 @@ def health_check():
     }
 
 @app.get("/api/videos")
-def get_videos():
+async def get_videos(response: Response):
     """Get videos from Firestore."""
-    if db is None:
-        return [
-            {"id": "mock1", "title": "Mock Video (Firestore not connected)", "description": "This is a mock video", "year": "2025", "category": "House Chambers"}
-        ]
+    if get_db() is None:
+        return MOCK_VIDEOS
     
     try:
-        # Get videos from Firestore
-        videos_ref = db.collection('videos').limit(10)
-        videos = []
-        
-        for doc in videos_ref.stream():
-            data = doc.to_dict()
-            videos.append({
-                "id": doc.id,
-                "title": f"{data.get('category', 'Unknown')} - {data.get('session_name', 'Unknown')}",
-                "description": f"Legislative Session {data.get('year', 'Unknown')}",
-                "year": data.get('year', 'Unknown'),
-                "category": data.get('category', 'Unknown'),
-                "date": data.get('last_modified') or data.get('created_at'),
-                "url": data.get('gcs_path', '')
-            })
-        
-        return videos
+        response.headers["Cache-Control"] = LIST_CACHE_CONTROL
+        return await get_cached('videos', LIST_CACHE_TTL, lambda: list_media('video'))
     except Exception as e:
         logger.error(f"Error getting videos: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/audio")
-def get_audio():
+async def get_audio(response: Response):
     """Get audio files from Firestore."""
-    if db is None:
-        return [
-            {"id": "mock1", "title": "Mock Audio (Firestore not connected)", "description": "This is a mock audio file", "year": "2025", "category": "House Chambers"}
-        ]
+    if get_db() is None:
+        return MOCK_AUDIO
     
     try:
-        # Get audio from Firestore
-        audio_ref = db.collection('audio').limit(10)
-        audio_files = []
-        
-        for doc in audio_ref.stream():
-            data = doc.to_dict()
-            audio_files.append({
-                "id": doc.id,
-                "title": f"{data.get('category', 'Unknown')} - {data.get('session_name', 'Unknown')}",
-                "description": f"Legislative Session {data.get('year', 'Unknown')}",
-                "year": data.get('year', 'Unknown'),
-                "category": data.get('category', 'Unknown'),
-                "date": data.get('last_modified') or data.get('created_at'),
-                "url": data.get('gcs_path', '')
-            })
-        
-        return audio_files
+        response.headers["Cache-Control"] = LIST_CACHE_CONTROL
+        return await get_cached('audio', LIST_CACHE_TTL, lambda: list_media('audio'))
     except Exception as e:
         logger.error(f"Error getting audio: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/transcripts")
-def get_transcripts():
+async def get_transcripts(response: Response):
     """Get transcripts from Firestore."""
-    if db is None:
-        return [
-            {"id": "mock1", "title": "Mock Transcript (Firestore not connected)", "description": "This is a mock transcript", "year": "2025", "category": "House Chambers"}
-        ]
+    if get_db() is None:
+        return MOCK_TRANSCRIPTS
     
     try:
-        # Get transcripts from Firestore
-        transcripts_ref = db.collection('transcripts').limit(10)
-        transcripts = []
-        
-        for doc in transcripts_ref.stream():
-            data = doc.to_dict()
-            transcripts.append({
-                "id": doc.id,
-                "title": f"{data.get('category', 'Unknown')} - {data.get('session_name', 'Unknown')}",
-                "description": f"Legislative Session {data.get('year', 'Unknown')}",
-                "year": data.get('year', 'Unknown'),
-                "category": data.get('category', 'Unknown'),
-                "date": data.get('last_modified') or data.get('created_at'),
-                "url": data.get('gcs_path', '')
-            })
-        
-        return transcripts
+        response.headers["Cache-Control"] = LIST_CACHE_CONTROL
+        return await get_cached('transcripts', LIST_CACHE_TTL, lambda: list_media('transcript'))
     except Exception as e:
         logger.error(f"Error getting transcripts: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+async def load_stats():
+    """Count the documents in each media collection."""
+    # Server-side COUNT aggregations, all in flight at once; get_cached already
+    # holds the result for STATS_CACHE_TTL, so skip the client's own cache
+    stats = await get_db().get_statistics(refresh=True)
+    
+    return {
+        "total": stats['videos'] + stats['audio'] + stats['transcripts'],
+        "videos": stats['videos'],
+        "audio": stats['audio'],
+        "transcripts": stats['transcripts']
+    }
+
 @app.get("/api/stats")
-def get_stats():
+async def get_stats(response: Response):
     """Get media statistics from Firestore."""
-    if db is None:
-        return {"total": 0, "videos": 0, "audio": 0, "transcripts": 0}
+    if get_db() is None:
+        return EMPTY_STATS
     
     try:
-        # Count documents in each collection
-        videos = len(list(db.collection('videos').limit(1000).stream()))
-        audio = len(list(db.collection('audio').limit(1000).stream()))
-        transcripts = len(list(db.collection('transcripts').limit(1000).stream()))
-        
-        return {
-            "total": videos + audio + transcripts,
-            "videos": videos,
-            "audio": audio,
-            "transcripts": transcripts
-        }
+        # Counts change slowly, so they're kept longer than the lists
+        response.headers["Cache-Control"] = STATS_CACHE_CONTROL
+        return await get_cached('stats', STATS_CACHE_TTL, load_stats)
     except Exception as e:
         logger.error(f"Error getting stats: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -196,5 +252,7 @@ def get_stats():
 if __name__ == "__main__":
     import uvicorn
     port = int(os.environ.get("PORT", 8080))
-    logger.info(f"Starting simplified Firestore API server on port {port}")
-    uvicorn.run("simple_firestore_api:app", host="0.0.0.0", port=port)
\ No newline at end of file
+    # Worker processes serve requests in parallel; each has its own Firestore client
+    workers = int(os.environ.get("WEB_CONCURRENCY", 1))
+    logger.info(f"Starting simplified Firestore API server on port {port} with {workers} worker(s)")
+    uvicorn.run("simple_firestore_api:app", host="0.0.0.0", port=port, workers=workers)
\ No newline at end of file
@@ -4,7 +4,10 @@ Maintains a record of transcripts, their processing status, and upload history.
 """
 
 import os
+import queue
+import atexit
 import logging
+from logging.handlers import QueueHandler, QueueListener
 from datetime import datetime
 from sqlalchemy import create_engine, Column, Integer, String, DateTime, Boolean, Float, inspect
 from sqlalchemy.ext.declarative import declarative_base
@@ -20,14 +23,24 @@ os.makedirs(logs_dir, exist_ok=True)
 os.makedirs(db_dir, exist_ok=True)
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(os.path.join(logs_dir, 'transcript_db.log')),
+# Only when the calling script hasn't configured logging already
+if not logging.getLogger().handlers:
+    # Records are queued and written out by a background thread, so logging calls
+    # don't wait on file or console I/O
+    log_queue = queue.SimpleQueue()
+    log_listener = QueueListener(
+        log_queue,
+        logging.FileHandler(os.path.join(logs_dir, 'transcript_db.log'), delay=True),
         logging.StreamHandler()
-    ]
-)
+    )
+    log_listener.start()
+    atexit.register(log_listener.stop)
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[QueueHandler(log_queue)]
+    )
 
 logger = logging.getLogger('transcript_db')
 
@@ -156,6 +169,15 @@ def get_unprocessed_transcripts():
         session.close()
 
 
+def iter_unprocessed_transcripts(batch_size=500):
+    """Iterate over transcripts that haven't been processed yet, loading batch_size rows at a time."""
+    session = Session()
+    try:
+        yield from session.query(Transcript).filter_by(processed=False).order_by(Transcript.id).yield_per(batch_size)
+    finally:
+        session.close()
+
+
 def get_processed_not_uploaded_transcripts():
     """Get all transcripts that have been processed but not uploaded."""
     session = Session()
@@ -174,5 +196,14 @@ def get_all_transcripts():
         session.close()
 
 
+def iter_all_transcripts(batch_size=500):
+    """Iterate over all transcript records, loading batch_size rows at a time."""
+    session = Session()
+    try:
+        yield from session.query(Transcript).order_by(Transcript.id).yield_per(batch_size)
+    finally:
+        session.close()
+
+
 # Initialize the database when this module is imported
 init_db()
\ No newline at end of file
@@ -5,9 +5,13 @@ Maintains the same interface as transcript_db.py but uses Firestore as the backe
 """
 
 import os
+import queue
+import atexit
 import logging
-from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from datetime import datetime, timezone
 from dataclasses import dataclass
+from google.api_core.exceptions import AlreadyExists
 
 # Local imports
 from firestore_db import get_firestore_db, FirestoreDB
@@ -20,19 +24,57 @@ logs_dir = os.path.join(base_dir, 'data', 'logs')
 os.makedirs(logs_dir, exist_ok=True)
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(os.path.join(logs_dir, 'transcript_db_firestore.log')),
+# Only when the calling script hasn't configured logging already
+if not logging.getLogger().handlers:
+    # Records are queued and written out by a background thread, so logging calls
+    # don't wait on file or console I/O
+    log_queue = queue.SimpleQueue()
+    log_listener = QueueListener(
+        log_queue,
+        logging.FileHandler(os.path.join(logs_dir, 'transcript_db_firestore.log'), delay=True),
         logging.StreamHandler()
-    ]
-)
+    )
+    log_listener.start()
+    atexit.register(log_listener.stop)
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[QueueHandler(log_queue)]
+    )
 
 logger = logging.getLogger('transcript_db_firestore')
 
+# Media type and Firestore collection for each known file extension
+_MEDIA_TYPES_BY_EXT = {
+    '.mp4': ('video', 'videos'),
+    '.avi': ('video', 'videos'),
+    '.mov': ('video', 'videos'),
+    '.mp3': ('audio', 'audio'),
+    '.wav': ('audio', 'audio'),
+    '.m4a': ('audio', 'audio'),
+    '.txt': ('transcript', 'transcripts'),
+    '.pdf': ('transcript', 'transcripts'),
+    '.docx': ('transcript', 'transcripts'),
+    '.md': ('transcript', 'transcripts'),
+}
+_UNKNOWN_MEDIA_TYPE = ('unknown', 'other')
+
+# Document fields read by firestore_doc_to_transcript; list queries fetch only these
+TRANSCRIPT_FIELDS = [
+    'year', 'category', 'session_name', 'file_name', 'original_path', 'file_path',
+    'file_size', 'last_modified', 'processed', 'uploaded', 'upload_path',
+    'upload_date', 'error_message', 'created_at', 'updated_at'
+]
+
+# Collections searched for a file path, in order of preference
+_LOOKUP_COLLECTIONS = ('transcripts', 'audio', 'videos', 'other')
 
-@dataclass
+# Characters replaced or dropped to make document IDs Firestore-friendly
+_DOC_ID_TRANSLATION = str.maketrans({'/': '_', ' ': '_', '(': None, ')': None})
+
+
+@dataclass(slots=True)
 class Transcript:
     """Compatibility class for SQLite Transcript model."""
     id: str
@@ -60,6 +102,7 @@ def init_db():
 
 def firestore_doc_to_transcript(doc_data):
     """Convert a Firestore document to a Transcript object."""
+    created_at = doc_data.get('created_at') or datetime.now(timezone.utc)
     return Transcript(
         id=doc_data.get('_id', ''),
         year=doc_data.get('year', ''),
@@ -74,28 +117,28 @@ def firestore_doc_to_transcript(doc_data):
         upload_path=doc_data.get('upload_path'),
         upload_date=doc_data.get('upload_date'),
         error_message=doc_data.get('error_message'),
-        created_at=doc_data.get('created_at', datetime.now()),
-        updated_at=doc_data.get('updated_at', doc_data.get('created_at', datetime.now()))
+        created_at=created_at,
+        updated_at=doc_data.get('updated_at') or created_at
     )
 
 
+def media_type_for_path(file_path):
+    """Get the (media_type, collection) pair for a file based on its extension."""
+    return _MEDIA_TYPES_BY_EXT.get(os.path.splitext(file_path)[1].lower(), _UNKNOWN_MEDIA_TYPE)
+
+
+def _find_transcript_doc(file_path):
+    """Find the Firestore document for a file path, tagged with its _id and _collection."""
+    # Search all collections at once rather than one after another
+    return get_firestore_db().get_media_by_path(file_path, _LOOKUP_COLLECTIONS)
+
+
 def get_transcript_by_path(file_path):
     """Get a transcript record by its file path."""
-    db = get_firestore_db()
     try:
-        # Search in all collections
-        for collection in ['transcripts', 'audio', 'videos', 'other']:
-            docs = list(db.client.collection(collection)
-                       .where('original_path', '==', file_path)
-                       .limit(1)
-                       .stream())
-            
-            if docs:
-                doc = docs[0]
-                doc_data = doc.to_dict()
-                doc_data['_id'] = doc.id
-                doc_data['_collection'] = collection
-                return firestore_doc_to_transcript(doc_data)
+        doc_data = _find_transcript_doc(file_path)
+        if doc_data:
+            return firestore_doc_to_transcript(doc_data)
     except Exception as e:
         logger.error(f"Error getting transcript by path {file_path}: {e}")
     
@@ -106,34 +149,16 @@ def add_transcript(year, category, session_name, file_name, file_path, file_size
     """Add a new transcript to the database."""
     db = get_firestore_db()
     try:
-        # Check if transcript already exists
-        existing = get_transcript_by_path(file_path)
-        if existing:
-            logger.debug(f"Transcript already exists: {file_path}")
-            return existing
-        
         # Determine media type based on file extension
-        file_ext = os.path.splitext(file_path)[1].lower()
-        
-        if file_ext in ['.mp4', '.avi', '.mov']:
-            media_type = 'video'
-            collection = 'videos'
-        elif file_ext in ['.mp3', '.wav', '.m4a']:
-            media_type = 'audio'
-            collection = 'audio'
-        elif file_ext in ['.txt', '.pdf', '.docx', '.md']:
-            media_type = 'transcript'
-            collection = 'transcripts'
-        else:
-            media_type = 'unknown'
-            collection = 'other'
+        media_type, collection = media_type_for_path(file_path)
         
         # Generate consistent document ID
         doc_id = f"{year}_{category}_{session_name}_{media_type}_{os.path.basename(file_path)}"
         # Clean ID to make it Firestore-friendly
-        doc_id = doc_id.replace('/', '_').replace(' ', '_').replace('(', '').replace(')', '')
+        doc_id = doc_id.translate(_DOC_ID_TRANSLATION)
         
         # Create document data
+        now = datetime.now(timezone.utc)
         doc_data = {
             'year': year,
             'category': category,
@@ -141,18 +166,25 @@ def add_transcript(year, category, session_name, file_name, file_path, file_size
             'file_name': file_name,
             'original_path': file_path,
             'file_path': file_path,  # For compatibility
-            'file_size': file_size,
-            'last_modified': last_modified,
             'processed': False,
             'uploaded': False,
             'media_type': media_type,
-            'created_at': datetime.now(),
-            'updated_at': datetime.now()
+            'created_at': now,
+            'updated_at': now
         }
+        # Optional fields are only stored when known; readers default missing fields to None
+        if file_size is not None:
+            doc_data['file_size'] = file_size
+        if last_modified is not None:
+            doc_data['last_modified'] = last_modified
         
-        # Add the document to Firestore
-        doc_ref = db.client.collection(collection).document(doc_id)
-        doc_ref.set(doc_data)
+        # Add the document to Firestore. The ID is derived from the path, so
+        # creating it fails if the transcript is already there, with no lookup first
+        try:
+            db.create_media(doc_id, doc_data, collection)
+        except AlreadyExists:
+            logger.debug(f"Transcript already exists: {file_path}")
+            return firestore_doc_to_transcript(db.get_media_by_id(doc_id, collection))
         logger.info(f"Added new transcript to Firestore: {file_path}")
         
         # Add ID for return
@@ -171,12 +203,18 @@ def update_transcript_status(file_path, processed=None, uploaded=None, upload_pa
     db = get_firestore_db()
     try:
         # Find the transcript by file path
-        transcript = get_transcript_by_path(file_path)
-        if not transcript:
+        try:
+            doc_data = _find_transcript_doc(file_path)
+        except Exception as e:
+            logger.error(f"Error getting transcript by path {file_path}: {e}")
+            doc_data = None
+        if not doc_data:
             logger.warning(f"Transcript not found for update: {file_path}")
             return None
+        transcript = firestore_doc_to_transcript(doc_data)
         
         # Prepare update data
+        now = datetime.now(timezone.utc)
         update_data = {}
         
         if processed is not None:
@@ -185,7 +223,7 @@ def update_transcript_status(file_path, processed=None, uploaded=None, upload_pa
         if uploaded is not None:
             update_data['uploaded'] = uploaded
             if uploaded:
-                update_data['upload_date'] = datetime.now()
+                update_data['upload_date'] = now
         
         if upload_path is not None:
             update_data['upload_path'] = upload_path
@@ -194,27 +232,16 @@ def update_transcript_status(file_path, processed=None, uploaded=None, upload_pa
             update_data['error_message'] = error_message
             
         # Add updated timestamp
-        update_data['updated_at'] = datetime.now()
+        update_data['updated_at'] = now
         
-        # Determine collection
-        if hasattr(transcript, '_collection') and transcript._collection:
-            collection = transcript._collection
-        else:
-            # Determine collection based on file extension
-            file_ext = os.path.splitext(file_path)[1].lower()
-            if file_ext in ['.mp4', '.avi', '.mov']:
-                collection = 'videos'
-            elif file_ext in ['.mp3', '.wav', '.m4a']:
-                collection = 'audio'
-            elif file_ext in ['.txt', '.pdf', '.docx', '.md']:
-                collection = 'transcripts'
-            else:
-                collection = 'other'
+        # Update the document in the collection the lookup found it in
+        collection = doc_data['_collection']
         
         # Update the document in Firestore
         if hasattr(transcript, 'id') and transcript.id:
-            doc_ref = db.client.collection(collection).document(transcript.id)
-            doc_ref.update(update_data)
+            if not db.update_media(transcript.id, update_data, collection):
+                logger.warning(f"Could not update transcript: {file_path}")
+                return None
             logger.info(f"Updated transcript status in Firestore: {file_path}")
             
             # Update the transcript object for return
@@ -237,17 +264,8 @@ def get_unprocessed_transcripts():
     results = []
     
     try:
-        # Get unprocessed docs from each collection
-        for collection in ['transcripts', 'audio', 'videos', 'other']:
-            docs = list(db.client.collection(collection)
-                       .where('processed', '==', False)
-                       .stream())
-            
-            for doc in docs:
-                doc_data = doc.to_dict()
-                doc_data['_id'] = doc.id
-                doc_data['_collection'] = collection
-                results.append(firestore_doc_to_transcript(doc_data))
+        # Get unprocessed docs from all collections concurrently
+        results = [firestore_doc_to_transcript(doc_data) for doc_data in db.get_unprocessed_media(fields=TRANSCRIPT_FIELDS)]
     
     except Exception as e:
         logger.error(f"Error getting unprocessed transcripts: {e}")
@@ -255,24 +273,26 @@ def get_unprocessed_transcripts():
     return results
 
 
+def iter_unprocessed_transcripts(batch_size=500):
+    """Iterate over transcripts that haven't been processed yet, fetching batch_size documents per page."""
+    db = get_firestore_db()
+    
+    try:
+        for doc_data in db.iter_unprocessed_media(fields=TRANSCRIPT_FIELDS, chunk_size=batch_size):
+            yield firestore_doc_to_transcript(doc_data)
+    
+    except Exception as e:
+        logger.error(f"Error iterating unprocessed transcripts: {e}")
+
+
 def get_processed_not_uploaded_transcripts():
     """Get all transcripts that have been processed but not uploaded."""
     db = get_firestore_db()
     results = []
     
     try:
-        # Get processed but not uploaded docs from each collection
-        for collection in ['transcripts', 'audio', 'videos', 'other']:
-            docs = list(db.client.collection(collection)
-                       .where('processed', '==', True)
-                       .where('uploaded', '==', False)
-                       .stream())
-            
-            for doc in docs:
-                doc_data = doc.to_dict()
-                doc_data['_id'] = doc.id
-                doc_data['_collection'] = collection
-                results.append(firestore_doc_to_transcript(doc_data))
+        # Get processed but not uploaded docs from all collections concurrently
+        results = [firestore_doc_to_transcript(doc_data) for doc_data in db.get_processed_not_uploaded_media(fields=TRANSCRIPT_FIELDS)]
     
     except Exception as e:
         logger.error(f"Error getting processed not uploaded transcripts: {e}")
@@ -286,15 +306,8 @@ def get_all_transcripts():
     results = []
     
     try:
-        # Get all docs from each collection
-        for collection in ['transcripts', 'audio', 'videos', 'other']:
-            docs = list(db.client.collection(collection).stream())
-            
-            for doc in docs:
-                doc_data = doc.to_dict()
-                doc_data['_id'] = doc.id
-                doc_data['_collection'] = collection
-                results.append(firestore_doc_to_transcript(doc_data))
+        # Get all docs from all collections concurrently
+        results = [firestore_doc_to_transcript(doc_data) for doc_data in db.get_all_media(fields=TRANSCRIPT_FIELDS)]
     
     except Exception as e:
         logger.error(f"Error getting all transcripts: {e}")
@@ -302,10 +315,22 @@ def get_all_transcripts():
     return results
 
 
+def iter_all_transcripts(batch_size=500):
+    """Iterate over all transcript records, fetching batch_size documents per page."""
+    db = get_firestore_db()
+    
+    try:
+        for doc_data in db.iter_all_media(fields=TRANSCRIPT_FIELDS, chunk_size=batch_size):
+            yield firestore_doc_to_transcript(doc_data)
+    
+    except Exception as e:
+        logger.error(f"Error iterating transcripts: {e}")
+
+
 # Initialize the database when this module is imported
 init_db()
 
 if __name__ == "__main__":
     # Test the module
     print("Testing transcript_db_firestore compatibility module")
-    print(f"Found {len(get_all_transcripts())} transcripts in Firestore")
\ No newline at end of file
+    print(f"Found {sum(1 for _ in iter_all_transcripts())} transcripts in Firestore")
\ No newline at end of file